@@ -6,13 +6,18 @@ from __future__ import annotations
 
 import argparse
 import csv
+import importlib.util
 import json
+import mmap
+import os
 import re
 import sys
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Container, Dict, Iterator, List, Optional, Set, Tuple
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 if str(PROJECT_ROOT) not in sys.path:
@@ -20,9 +25,12 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from utils.downloader import SECDownloader
 from utils.index_parser import SECIndexParser
-from utils.file_manager import FileManager
+from utils.file_manager import FileManager, loads_json
 
 
+# Pending cik/ticker map updates written to disk per flush.
+MAP_FLUSH_EVERY = 100
+
 FILING_CODE_MAP: Dict[str, Tuple[str, str]] = {
     "6k": ("6-K", "6-K"),
     "6ka": ("6-K/A", "6-KA"),
@@ -237,26 +245,26 @@ def _report_progress(
     )
 
 
-def _extract_dual_dates(html_content: str) -> Tuple[Optional[str], Optional[int], Dict[str, str]]:
+def _extract_dual_dates(html_content: bytes) -> Tuple[Optional[str], Optional[int], Dict[str, str]]:
     tags_found: Dict[str, str] = {}
 
     fy_match = re.search(
-        r'name="dei:DocumentFiscalYearFocus"[^>]*>\s*([12]\d{3})\s*<',
+        rb'name="dei:DocumentFiscalYearFocus"[^>]*>\s*([12]\d{3})\s*<',
         html_content,
         flags=re.IGNORECASE,
     )
     fiscal_year = int(fy_match.group(1)) if fy_match else None
     if fy_match:
-        tags_found["dei:DocumentFiscalYearFocus"] = fy_match.group(1)
+        tags_found["dei:DocumentFiscalYearFocus"] = fy_match.group(1).decode("ascii")
 
     period_match = re.search(
-        r'name="dei:DocumentPeriodEndDate"[^>]*>\s*([12]\d{3}-\d{2}-\d{2})\s*<',
+        rb'name="dei:DocumentPeriodEndDate"[^>]*>\s*([12]\d{3}-\d{2}-\d{2})\s*<',
         html_content,
         flags=re.IGNORECASE,
     )
-    period_of_report = period_match.group(1) if period_match else None
+    period_of_report = period_match.group(1).decode("ascii") if period_match else None
     if period_match:
-        tags_found["dei:DocumentPeriodEndDate"] = period_match.group(1)
+        tags_found["dei:DocumentPeriodEndDate"] = period_of_report
 
     if fiscal_year is None and period_of_report:
         fiscal_year = int(period_of_report[:4])
@@ -264,22 +272,123 @@ def _extract_dual_dates(html_content: str) -> Tuple[Optional[str], Optional[int]
     return period_of_report, fiscal_year, tags_found
 
 
-def _extract_trading_symbols(html_content: str) -> List[str]:
+def _extract_trading_symbols(html_content: bytes) -> List[str]:
     symbols = re.findall(
-        r'name="dei:TradingSymbol"[^>]*>\s*([A-Za-z0-9\.\-]+)\s*<',
+        rb'name="dei:TradingSymbol"[^>]*>\s*([A-Za-z0-9\.\-]+)\s*<',
         html_content,
         flags=re.IGNORECASE,
     )
     out: List[str] = []
     seen: Set[str] = set()
     for sym in symbols:
-        token = sym.strip().upper()
+        token = sym.decode("ascii").strip().upper()
         if token and token not in seen:
             seen.add(token)
             out.append(token)
     return out
 
 
+def _fetch_filing(
+    downloader: SECDownloader,
+    cik: str,
+    accession: str,
+    part_path: Path,
+) -> Tuple[str, str, Optional[str], Optional[int], Dict[str, str], List[str]]:
+    """
+    Download one filing to part_path and parse its dual-date/ticker metadata
+    (worker stage). The document is scanned through mmap, never held as str.
+    """
+    try:
+        ext, normalized_cik = downloader.download_filing_by_accession_to_file(cik, accession, str(part_path))
+        with part_path.open("rb") as f:
+            if part_path.stat().st_size == 0:
+                raise ValueError("empty filing document")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                period_of_report, fiscal_year, tags_found = _extract_dual_dates(content)
+                symbols = _extract_trading_symbols(content)
+    except Exception:
+        part_path.unlink(missing_ok=True)
+        raise
+    return ext, normalized_cik, period_of_report, fiscal_year, tags_found, symbols
+
+
+def _load_saved_accessions(
+    fm: FileManager,
+    output_dir: Path,
+    folder_form: str,
+    target_ciks: Set[str],
+) -> Dict[str, Dict[str, object]]:
+    """
+    Map accession number -> saved meta for filings already stored under
+    output_dir/<cik>/<fiscal_year>/<folder_form>, so reruns skip the fetch.
+    """
+    saved: Dict[str, Dict[str, object]] = {}
+    try:
+        cik_entries = [e for e in os.scandir(output_dir) if e.is_dir()]
+    except FileNotFoundError:
+        return saved
+    for cik_entry in cik_entries:
+        cik = cik_entry.name
+        if cik.startswith(("_", ".")) or (target_ciks and cik not in target_ciks):
+            continue
+        with os.scandir(cik_entry.path) as years:
+            year_names = [e.name for e in years if e.is_dir()]
+        for year in year_names:
+            meta_path = Path(cik_entry.path, year, folder_form, f"{cik}_{year}_{folder_form}_meta.json")
+            try:
+                meta = loads_json(meta_path.read_bytes())
+            except (OSError, ValueError):
+                continue
+            if not isinstance(meta, dict) or not str(meta.get("fiscal_year", "")).isdigit():
+                continue
+            accession = meta.get("accession_number")
+            if accession and fm.find_existing_filing(cik, year, folder_form):
+                saved[str(accession)] = meta
+    return saved
+
+
+def _iter_fetched(
+    executor: ThreadPoolExecutor,
+    downloader: SECDownloader,
+    records: List[Dict[str, str]],
+    part_dir: Path,
+    window: int,
+    skip: Container[str] = (),
+) -> Iterator[Tuple[Dict[str, str], Optional[Future]]]:
+    """
+    Yield (record, future) pairs in record order while keeping at most
+    `window` fetches submitted ahead of the consumer. Records without an
+    accession or whose accession is in `skip` are yielded with no future.
+    """
+    pending: deque = deque()
+    records_iter = iter(records)
+
+    def submit_next() -> bool:
+        record = next(records_iter, None)
+        if record is None:
+            return False
+        accession = record.get("accession_number", "")
+        future = (
+            executor.submit(
+                _fetch_filing,
+                downloader,
+                (record.get("cik_padded") or "").zfill(10),
+                accession,
+                part_dir / f"{accession}.part",
+            )
+            if accession and accession not in skip
+            else None
+        )
+        pending.append((record, future))
+        return True
+
+    while len(pending) < window and submit_next():
+        pass
+    while pending:
+        yield pending.popleft()
+        submit_next()
+
+
 def _parse_filing_date(value: str) -> Optional[date]:
     for fmt in ("%Y-%m-%d", "%Y-%m", "%Y%m%d"):
         try:
@@ -371,31 +480,32 @@ def _load_cik_ticker_map(path: Path) -> Dict[Tuple[str, str], Dict[str, str]]:
     return rows
 
 
+CIK_TICKER_MAP_FIELDS = ("fiscal_year", "cik", "ticker", "source", "updated_at")
+
+
 def _save_cik_ticker_map(path: Path, rows: Dict[Tuple[str, str], Dict[str, str]]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    ordered = sorted(rows.values(), key=lambda r: (r["fiscal_year"], r["cik"]))
-    with path.open("w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=["fiscal_year", "cik", "ticker", "source", "updated_at"],
+    with path.open("w", encoding="utf-8", newline="", buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        writer.writerow(CIK_TICKER_MAP_FIELDS)
+        # Keys are (fiscal_year, cik), so sorting keys gives the row order.
+        writer.writerows(
+            tuple(rows[key].get(field, "") for field in CIK_TICKER_MAP_FIELDS) for key in sorted(rows)
         )
-        writer.writeheader()
-        writer.writerows(ordered)
 
 
 def _upsert_cik_ticker_map(
-    path: Path,
+    rows: Dict[Tuple[str, str], Dict[str, str]],
     *,
     fiscal_year: int,
     cik: str,
     ticker: Optional[str],
-) -> None:
+) -> bool:
     if not ticker:
-        return
+        return False
     t = ticker.strip().upper()
     if not t:
-        return
-    rows = _load_cik_ticker_map(path)
+        return False
     key = (str(fiscal_year), cik.zfill(10))
     rows[key] = {
         "fiscal_year": str(fiscal_year),
@@ -404,7 +514,7 @@ def _upsert_cik_ticker_map(
         "source": "edgar",
         "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
     }
-    _save_cik_ticker_map(path, rows)
+    return True
 
 
 def _save_filing_and_meta(
@@ -414,20 +524,22 @@ def _save_filing_and_meta(
     fiscal_year: int,
     folder_form: str,
     extension: str,
-    html_content: str,
+    source_path: Path,
     meta: Dict[str, object],
     overwrite: bool,
+    compress: bool = False,
 ) -> str:
+    # store_html_file creates the filing directory; skipped filings need none.
     filing_dir = output_dir / cik / str(fiscal_year) / folder_form
-    filing_dir.mkdir(parents=True, exist_ok=True)
     base_name = f"{cik}_{fiscal_year}_{folder_form}"
     filing_path = filing_dir / f"{base_name}.{extension}"
     meta_path = filing_dir / f"{base_name}_meta.json"
 
-    if filing_path.exists() and not overwrite:
+    if not overwrite and fm.find_existing_filing(cik, str(fiscal_year), folder_form):
+        source_path.unlink(missing_ok=True)
         return "skipped_exists"
 
-    fm.save_html(str(filing_path), html_content)
+    fm.store_html_file(str(source_path), str(filing_path), compress=compress)
     with meta_path.open("w", encoding="utf-8") as f:
         json.dump(meta, f, indent=2)
     return "downloaded"
@@ -444,11 +556,16 @@ def download_from_edgar(
     ciks: Optional[List[str]],
     overwrite: bool,
     user_agent: str,
+    workers: int = 4,
+    compress: bool = False,
 ) -> None:
     downloader = SECDownloader(user_agent=user_agent)
     fm = FileManager(str(output_dir))
     map_path = output_dir / "_meta" / "cik_ticker_map_edgar.csv"
     legacy_map_path = output_dir / "_meta" / "cik_ticker_map.csv"
+    map_rows = _load_cik_ticker_map(map_path)
+    legacy_map_rows = _load_cik_ticker_map(legacy_map_path)
+    pending_map_updates = 0
     input_ticker_by_cik = _normalize_ticker_input_map(downloader, tickers)
 
     if date.today().month <= lookahead_months:
@@ -492,97 +609,150 @@ def download_from_edgar(
     start_time = time.monotonic()
     update_every = 1 if total <= 200 else max(1, total // 200)
 
-    for i, record in enumerate(filtered_records, start=1):
-        stats["processed"] += 1
-        cik = (record.get("cik_padded") or "").zfill(10)
-        accession = record.get("accession_number", "")
-        filing_date = record.get("date_filed", "")
-        status_prefix = f"[{i}/{total}] cik={cik} accession={accession} filed={filing_date}"
-        if not accession:
-            stats["failed_download"] += 1
-            print(f"{status_prefix} result=failed_download reason=missing_accession")
-            continue
-
-        try:
-            html_content, ext, normalized_cik = downloader.download_filing_by_accession(cik, accession)
-        except Exception:
-            stats["failed_download"] += 1
-            # Filing-date window already matched at least one target FY.
-            for fy in fiscal_years:
-                if _in_window_for_fiscal_year(filing_date, fy, lookahead_months):
-                    stats_by_year[fy]["failed_download"] += 1
-            print(f"{status_prefix} result=failed_download")
-            continue
-
-        period_of_report, fiscal_year, tags_found = _extract_dual_dates(html_content)
-        symbols = _extract_trading_symbols(html_content)
-        if fiscal_year is None:
-            stats["missing_fiscal_metadata"] += 1
-            for fy in fiscal_years:
-                if _in_window_for_fiscal_year(filing_date, fy, lookahead_months):
-                    stats_by_year[fy]["missing_fiscal_metadata"] += 1
-            print(f"{status_prefix} result=missing_fiscal_metadata")
-            continue
-        if fiscal_year not in fiscal_years:
-            stats["skipped_outside_target_fy"] += 1
-            print(f"{status_prefix} result=skipped_outside_target_fy fiscal_year={fiscal_year}")
-            continue
-
-        meta = {
-            "source": "edgar",
-            "cik": normalized_cik,
-            "fiscal_year": fiscal_year,
-            "filing_type": sec_form,
-            "folder_form": folder_form,
-            "filing_date": filing_date,
-            "period_of_report": period_of_report,
-            "accession_number": accession,
-            "source_file_name": record.get("file_name", ""),
-            "tags_found": tags_found,
-            "ticker_symbols": symbols,
-        }
-        state = _save_filing_and_meta(
-            fm=fm,
-            output_dir=output_dir,
-            cik=normalized_cik,
-            fiscal_year=fiscal_year,
-            folder_form=folder_form,
-            extension=ext,
-            html_content=html_content,
-            meta=meta,
-            overwrite=overwrite,
-        )
-        if state == "downloaded":
-            stats["downloaded"] += 1
-            stats_by_year[fiscal_year]["downloaded"] += 1
-            print(f"{status_prefix} result=downloaded fiscal_year={fiscal_year}")
-        else:
-            stats["skipped_exists"] += 1
-            stats_by_year[fiscal_year]["skipped_exists"] += 1
-            print(f"{status_prefix} result=skipped_exists fiscal_year={fiscal_year}")
-
-        preferred_ticker = symbols[0] if symbols else input_ticker_by_cik.get(normalized_cik)
-        _upsert_cik_ticker_map(
-            map_path,
-            fiscal_year=fiscal_year,
-            cik=normalized_cik,
-            ticker=preferred_ticker,
-        )
-        _upsert_cik_ticker_map(
-            legacy_map_path,
-            fiscal_year=fiscal_year,
-            cik=normalized_cik,
-            ticker=preferred_ticker,
+    # Download + metadata parsing run in a thread pool (the downloader paces
+    # requests across threads); saving and bookkeeping stay on this thread.
+    # Filings stream to part files and are moved into place once classified.
+    # Only 2 * workers fetches are in flight ahead of the consumer.
+    part_dir = output_dir / ".partial"
+    part_dir.mkdir(parents=True, exist_ok=True)
+    # Filings saved by an earlier run are recognised by accession number and
+    # not fetched again.
+    saved_accessions = (
+        {} if overwrite else _load_saved_accessions(fm, output_dir, folder_form, target_ciks)
+    )
+    workers = max(1, workers)
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        fetched = _iter_fetched(
+            executor, downloader, filtered_records, part_dir, window=2 * workers, skip=saved_accessions
         )
+        for i, (record, future) in enumerate(fetched, start=1):
+            stats["processed"] += 1
+            cik = (record.get("cik_padded") or "").zfill(10)
+            accession = record.get("accession_number", "")
+            filing_date = record.get("date_filed", "")
+            status_prefix = f"[{i}/{total}] cik={cik} accession={accession} filed={filing_date}"
+            saved_meta = saved_accessions.get(accession) if accession else None
+            if saved_meta is not None:
+                # Stored by an earlier run: reuse its meta instead of fetching.
+                fiscal_year = int(saved_meta["fiscal_year"])
+                normalized_cik = str(saved_meta.get("cik") or cik)
+                symbols = list(saved_meta.get("ticker_symbols") or [])
+            elif future is None:
+                stats["failed_download"] += 1
+                print(f"{status_prefix} result=failed_download reason=missing_accession")
+                continue
+            else:
+                try:
+                    (
+                        ext,
+                        normalized_cik,
+                        period_of_report,
+                        fiscal_year,
+                        tags_found,
+                        symbols,
+                    ) = future.result()
+                except Exception:
+                    stats["failed_download"] += 1
+                    # Filing-date window already matched at least one target FY.
+                    for fy in fiscal_years:
+                        if _in_window_for_fiscal_year(filing_date, fy, lookahead_months):
+                            stats_by_year[fy]["failed_download"] += 1
+                    print(f"{status_prefix} result=failed_download")
+                    continue
+
+            part_path = part_dir / f"{accession}.part"
+            if fiscal_year is None:
+                part_path.unlink(missing_ok=True)
+                stats["missing_fiscal_metadata"] += 1
+                for fy in fiscal_years:
+                    if _in_window_for_fiscal_year(filing_date, fy, lookahead_months):
+                        stats_by_year[fy]["missing_fiscal_metadata"] += 1
+                print(f"{status_prefix} result=missing_fiscal_metadata")
+                continue
+            if fiscal_year not in fiscal_years:
+                part_path.unlink(missing_ok=True)
+                stats["skipped_outside_target_fy"] += 1
+                print(f"{status_prefix} result=skipped_outside_target_fy fiscal_year={fiscal_year}")
+                continue
 
-        if (i % update_every == 0) or (i == total):
-            _report_progress(
-                processed=i,
-                total=total,
-                start_time=start_time,
-                stats=stats,
-            )
-
+            if saved_meta is not None:
+                state = "skipped_exists"
+            else:
+                meta = {
+                    "source": "edgar",
+                    "cik": normalized_cik,
+                    "fiscal_year": fiscal_year,
+                    "filing_type": sec_form,
+                    "folder_form": folder_form,
+                    "filing_date": filing_date,
+                    "period_of_report": period_of_report,
+                    "accession_number": accession,
+                    "source_file_name": record.get("file_name", ""),
+                    "tags_found": tags_found,
+                    "ticker_symbols": symbols,
+                }
+                state = _save_filing_and_meta(
+                    fm=fm,
+                    output_dir=output_dir,
+                    cik=normalized_cik,
+                    fiscal_year=fiscal_year,
+                    folder_form=folder_form,
+                    extension=ext,
+                    source_path=part_path,
+                    meta=meta,
+                    overwrite=overwrite,
+                    compress=compress,
+                )
+
+            if state == "downloaded":
+                stats["downloaded"] += 1
+                stats_by_year[fiscal_year]["downloaded"] += 1
+                print(f"{status_prefix} result=downloaded fiscal_year={fiscal_year}")
+            else:
+                stats["skipped_exists"] += 1
+                stats_by_year[fiscal_year]["skipped_exists"] += 1
+                print(f"{status_prefix} result=skipped_exists fiscal_year={fiscal_year}")
+
+            preferred_ticker = symbols[0] if symbols else input_ticker_by_cik.get(normalized_cik)
+            if _upsert_cik_ticker_map(
+                map_rows,
+                fiscal_year=fiscal_year,
+                cik=normalized_cik,
+                ticker=preferred_ticker,
+            ):
+                _upsert_cik_ticker_map(
+                    legacy_map_rows,
+                    fiscal_year=fiscal_year,
+                    cik=normalized_cik,
+                    ticker=preferred_ticker,
+                )
+                pending_map_updates += 1
+                if pending_map_updates >= MAP_FLUSH_EVERY:
+                    _save_cik_ticker_map(map_path, map_rows)
+                    _save_cik_ticker_map(legacy_map_path, legacy_map_rows)
+                    pending_map_updates = 0
+
+            if (i % update_every == 0) or (i == total):
+                _report_progress(
+                    processed=i,
+                    total=total,
+                    start_time=start_time,
+                    stats=stats,
+                )
+    finally:
+        # Also runs on errors and Ctrl-C: stop queued fetches, drop their part
+        # files and flush pending cik/ticker rows.
+        executor.shutdown(cancel_futures=True)
+        for leftover in part_dir.glob("*.part"):
+            leftover.unlink(missing_ok=True)
+        try:
+            part_dir.rmdir()
+        except OSError:
+            pass
+        if pending_map_updates:
+            _save_cik_ticker_map(map_path, map_rows)
+            _save_cik_ticker_map(legacy_map_path, legacy_map_rows)
     print("EDGAR download completed.")
     print(json.dumps(stats, indent=2))
     _write_download_run_report(
@@ -617,6 +787,17 @@ def main() -> None:
     )
     parser.add_argument("--overwrite", action="store_true", help="Overwrite existing filings.")
     parser.add_argument("--list-only", action="store_true", help="Build fiscal-year filing list only (no download).")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Concurrent filing downloads (default: 4). Requests stay rate-limited.",
+    )
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="Store filing HTML zstd-compressed (.zst); requires the zstandard package.",
+    )
     parser.add_argument(
         "--user_agent",
         required=True,
@@ -630,8 +811,13 @@ def main() -> None:
     sec_form, folder_form = FILING_CODE_MAP[filing_key]
 
     fiscal_years = sorted({int(y) for y in args.years})
-    if any(y < 1995 or y > 2100 for y in fiscal_years):
-        parser.error("Fiscal year must be between 1995 and 2100.")
+    max_year = date.today().year + 1
+    bad_years = [y for y in fiscal_years if not 1995 <= y <= max_year]
+    if bad_years:
+        parser.error(f"Fiscal year must be between 1995 and {max_year}; got {bad_years}.")
+
+    if args.compress and importlib.util.find_spec("zstandard") is None:
+        parser.error("--compress requires the zstandard package.")
 
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -668,6 +854,8 @@ def main() -> None:
         ciks=args.ciks,
         overwrite=args.overwrite,
         user_agent=args.user_agent,
+        workers=args.workers,
+        compress=args.compress,
     )
 
 
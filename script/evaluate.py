@@ -103,8 +103,8 @@ def stability_across_years(ranking_df: pd.DataFrame, top_k: int = 10) -> pd.Data
     for focal_firm, sub in df.groupby("focal_firm"):
         years = sorted(sub["year"].unique().tolist())
         for prev_year, curr_year in zip(years, years[1:]):
-            prev_set = set(sub[sub["year"] == prev_year].sort_values("rank")["peer_firm"].head(top_k).tolist())
-            curr_set = set(sub[sub["year"] == curr_year].sort_values("rank")["peer_firm"].head(top_k).tolist())
+            prev_set = set(sub[sub["year"] == prev_year].nsmallest(top_k, "rank")["peer_firm"].tolist())
+            curr_set = set(sub[sub["year"] == curr_year].nsmallest(top_k, "rank")["peer_firm"].tolist())
             union = prev_set | curr_set
             jaccard = float(len(prev_set & curr_set) / len(union)) if union else float("nan")
             rows.append(
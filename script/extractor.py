@@ -11,26 +11,30 @@ from __future__ import annotations
 import argparse
 import csv
 import json
+import os
 import sys
 import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Union
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from utils.config import ITEMS_10K, ITEMS_10Q
+from utils.config import ITEMS_10K_SET, ITEMS_10Q_SET
 from utils.extractor import ItemExtractor
+from utils.file_manager import ZSTD_SUFFIX, dumps_json, loads_json, read_html_file
 from utils.parser import SECParser
 from utils.structure_extractor import StructureExtractor
 
 
 ITEM_SCOPE_BY_FILING = {
-    "10-K": set(ITEMS_10K.keys()),
-    "10-KA": set(ITEMS_10K.keys()),
-    "10-Q": set(ITEMS_10Q.keys()),
-    "10-QA": set(ITEMS_10Q.keys()),
+    "10-K": ITEMS_10K_SET,
+    "10-KA": ITEMS_10K_SET,
+    "10-Q": ITEMS_10Q_SET,
+    "10-QA": ITEMS_10Q_SET,
 }
 
 
@@ -95,6 +99,14 @@ def _resolve_ciks_from_args(
     return target_ciks
 
 
+def _list_subdirs(path: Union[str, Path]) -> List[str]:
+    try:
+        with os.scandir(path) as it:
+            return [entry.path for entry in it if entry.is_dir()]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
 def _list_filing_files(
     filing_dir: Path,
     target_ciks: set[str],
@@ -103,31 +115,45 @@ def _list_filing_files(
 ) -> List[Path]:
     html_files: List[Path] = []
 
+    # DirEntry.is_dir()/is_file() use the type reported by readdir, so the
+    # walk needs no stat call per entry.
     if target_ciks:
-        cik_dirs = [filing_dir / t for t in sorted(target_ciks)]
+        cik_dirs = [os.path.join(filing_dir, t) for t in sorted(target_ciks)]
     else:
-        cik_dirs = [p for p in filing_dir.iterdir() if p.is_dir()]
+        cik_dirs = _list_subdirs(filing_dir)
 
     for cik_dir in cik_dirs:
-        if not cik_dir.exists() or not cik_dir.is_dir():
-            continue
-        for year_dir in cik_dir.iterdir():
-            if not year_dir.is_dir():
-                continue
-            if year_filter and year_dir.name not in year_filter:
+        for year_dir in _list_subdirs(cik_dir):
+            if year_filter and os.path.basename(year_dir) not in year_filter:
                 continue
-            for form_dir in year_dir.iterdir():
-                if not form_dir.is_dir():
+            for form_dir in _list_subdirs(year_dir):
+                if filing_filter and os.path.basename(form_dir).upper() != filing_filter.upper():
                     continue
-                if filing_filter and form_dir.name.upper() != filing_filter.upper():
-                    continue
-                for f in form_dir.iterdir():
-                    if f.is_file() and f.suffix.lower() in {".htm", ".html"}:
-                        html_files.append(f)
+                with os.scandir(form_dir) as it:
+                    file_names = {entry.name for entry in it if entry.is_file()}
+                for file_name in file_names:
+                    name = file_name.lower()
+                    if name.endswith(ZSTD_SUFFIX):
+                        # Compressed filing; an uncompressed copy takes precedence.
+                        name = name[: -len(ZSTD_SUFFIX)]
+                        if file_name[: -len(ZSTD_SUFFIX)] in file_names:
+                            continue
+                    if name.endswith((".htm", ".html")):
+                        html_files.append(Path(form_dir, file_name))
     html_files.sort()
     return html_files
 
 
+def _filing_base_name(html_path: Path) -> str:
+    """
+    Filing file name without extension, ignoring a trailing .zst.
+    """
+    name = html_path.name
+    if name.lower().endswith(ZSTD_SUFFIX):
+        name = name[: -len(ZSTD_SUFFIX)]
+    return Path(name).stem
+
+
 def _parse_path_parts(path: Path, filing_dir: Path) -> Dict[str, str]:
     rel = path.relative_to(filing_dir)
     parts = rel.parts
@@ -145,15 +171,18 @@ def _extract_items_for_file(
     parser: SECParser,
     item_extractor: ItemExtractor,
     overwrite: bool,
+    item_out: Optional[Path] = None,
+    html_content: Optional[str] = None,
 ) -> Optional[Path]:
-    base_name = html_path.stem
-    item_out = html_path.with_name(f"{base_name}_item.json")
+    if item_out is None:
+        item_out = html_path.with_name(f"{_filing_base_name(html_path)}_item.json")
     if item_out.exists() and not overwrite:
         return item_out
 
     meta = _parse_path_parts(html_path, filing_dir)
     filing_type = meta["filing"].upper()
-    html_content = html_path.read_text(encoding="utf-8", errors="ignore")
+    if html_content is None:
+        html_content = read_html_file(str(html_path), errors="ignore")
     toc_items = parser.parse_toc(html_content, filing_type)
     if not toc_items:
         return None
@@ -162,14 +191,22 @@ def _extract_items_for_file(
     if in_scope:
         selected = {k: v for k, v in toc_items.items() if k in in_scope}
     else:
-        selected = {k: v for k, v in toc_items.items()}
+        selected = toc_items
     if not selected:
         return None
 
+    # Item boundaries come from one scan of the filing, shared by every item.
+    try:
+        positions = parser.get_item_positions(html_content, selected)
+    except Exception:
+        positions = None
+
     extracted = {}
-    for item_num in sorted(selected.keys(), key=_item_sort_key):
+    for item_num in sorted(selected, key=_item_sort_key):
         try:
-            extracted[item_num] = item_extractor.extract_item(html_content, item_num, selected)
+            extracted[item_num] = item_extractor.extract_item(
+                html_content, item_num, selected, positions=positions
+            )
         except Exception as e:
             extracted[item_num] = {"error": str(e)}
 
@@ -181,7 +218,7 @@ def _extract_items_for_file(
         "toc_items": selected,
         "items": extracted,
     }
-    item_out.write_text(json.dumps(out, indent=2), encoding="utf-8")
+    item_out.write_bytes(dumps_json(out))
     return item_out
 
 
@@ -193,8 +230,9 @@ def _extract_structure_for_file(
     item_extractor: ItemExtractor,
     structure_extractor: StructureExtractor,
     overwrite: bool,
+    html_content: Optional[str] = None,
 ) -> Optional[Path]:
-    base_name = html_path.stem
+    base_name = _filing_base_name(html_path)
     str_out = html_path.with_name(f"{base_name}_str.json")
     if str_out.exists() and not overwrite:
         return str_out
@@ -203,7 +241,7 @@ def _extract_structure_for_file(
     item_payload = None
     if item_out.exists():
         try:
-            item_payload = json.loads(item_out.read_text(encoding="utf-8"))
+            item_payload = loads_json(item_out.read_bytes())
         except Exception:
             item_payload = None
 
@@ -214,10 +252,12 @@ def _extract_structure_for_file(
             parser=parser,
             item_extractor=item_extractor,
             overwrite=overwrite,
+            item_out=item_out,
+            html_content=html_content,
         )
         if not item_path or not item_path.exists():
             return None
-        item_payload = json.loads(item_path.read_text(encoding="utf-8"))
+        item_payload = loads_json(item_path.read_bytes())
 
     structures = {}
     for item_num, item_data in item_payload.get("items", {}).items():
@@ -240,10 +280,95 @@ def _extract_structure_for_file(
         "source_file": item_payload.get("source_file"),
         "structures": structures,
     }
-    str_out.write_text(json.dumps(out, indent=2), encoding="utf-8")
+    str_out.write_bytes(dumps_json(out))
     return str_out
 
 
+_WORKER_STATE: Dict[str, object] = {}
+
+
+def _init_worker() -> None:
+    """
+    Build one set of parsers/extractors per process.
+    """
+    _WORKER_STATE["parser"] = SECParser()
+    _WORKER_STATE["item_extractor"] = ItemExtractor()
+    _WORKER_STATE["structure_extractor"] = StructureExtractor()
+
+
+def _run_task(
+    task: str,
+    html_path: Path,
+    filing_dir: Path,
+    overwrite: bool,
+    html_content: Optional[str] = None,
+) -> Optional[Path]:
+    """
+    Run one extraction task for a filing using this process's extractors.
+    """
+    if not _WORKER_STATE:
+        _init_worker()
+    if task == "item":
+        return _extract_items_for_file(
+            html_path=html_path,
+            filing_dir=filing_dir,
+            parser=_WORKER_STATE["parser"],
+            item_extractor=_WORKER_STATE["item_extractor"],
+            overwrite=overwrite,
+            html_content=html_content,
+        )
+    return _extract_structure_for_file(
+        html_path=html_path,
+        filing_dir=filing_dir,
+        parser=_WORKER_STATE["parser"],
+        item_extractor=_WORKER_STATE["item_extractor"],
+        structure_extractor=_WORKER_STATE["structure_extractor"],
+        overwrite=overwrite,
+        html_content=html_content,
+    )
+
+
+def _read_html_if_needed(task: str, html_path: Path, overwrite: bool) -> Optional[str]:
+    """
+    Read a filing only when its task will parse the HTML (outputs missing or
+    overwritten, and no item JSON to reuse for the structure task).
+    """
+    base_name = _filing_base_name(html_path)
+    item_out = html_path.with_name(f"{base_name}_item.json")
+    if task == "item":
+        if item_out.exists() and not overwrite:
+            return None
+    else:
+        str_out = html_path.with_name(f"{base_name}_str.json")
+        if (str_out.exists() and not overwrite) or item_out.exists():
+            return None
+    return read_html_file(str(html_path), errors="ignore")
+
+
+def _run_sequential(
+    task: str,
+    html_files: List[Path],
+    filing_dir: Path,
+    overwrite: bool,
+) -> Iterator[Optional[Path]]:
+    """
+    Run tasks in-process, reading the next filing on a background thread
+    while the current one is being extracted.
+    """
+    if not html_files:
+        return
+    with ThreadPoolExecutor(max_workers=1) as reader:
+        pending: Future = reader.submit(_read_html_if_needed, task, html_files[0], overwrite)
+        for idx, html_path in enumerate(html_files):
+            try:
+                html_content = pending.result()
+            except Exception:
+                html_content = None
+            if idx + 1 < len(html_files):
+                pending = reader.submit(_read_html_if_needed, task, html_files[idx + 1], overwrite)
+            yield _run_task(task, html_path, filing_dir, overwrite, html_content)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Extract items or structures from downloaded filings.")
     parser.add_argument("--ticker", nargs="+", dest="tickers", default=None, help="Ticker symbol filter(s).")
@@ -259,16 +384,18 @@ def main() -> None:
         default=25,
         help="Print progress every N filings (default: 25).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes for extraction (default: CPU count; 1 = run in-process).",
+    )
     args = parser.parse_args()
 
     filing_dir = Path(args.filing_dir)
     if not filing_dir.exists() or not filing_dir.is_dir():
         raise FileNotFoundError(f"filing_dir not found: {filing_dir}")
 
-    sec_parser = SECParser()
-    item_extractor = ItemExtractor()
-    structure_extractor = StructureExtractor()
-
     target_ciks = _resolve_ciks_from_args(filing_dir, args.tickers, args.ciks)
     year_filter = {str(y).strip() for y in (args.years or []) if str(y).strip()}
     if args.tickers and not target_ciks and not args.ciks:
@@ -282,39 +409,39 @@ def main() -> None:
     skipped = 0
     started_at = time.time()
     total = len(html_files)
-    for i, html_file in enumerate(html_files, start=1):
-        if args.task == "item":
-            out = _extract_items_for_file(
-                html_path=html_file,
-                filing_dir=filing_dir,
-                parser=sec_parser,
-                item_extractor=item_extractor,
-                overwrite=args.overwrite,
-            )
-        else:
-            out = _extract_structure_for_file(
-                html_path=html_file,
-                filing_dir=filing_dir,
-                parser=sec_parser,
-                item_extractor=item_extractor,
-                structure_extractor=structure_extractor,
-                overwrite=args.overwrite,
-            )
-        if out:
-            done += 1
-        else:
-            skipped += 1
-        if total > 0 and (i == 1 or i % max(args.progress_every, 1) == 0 or i == total):
-            elapsed = time.time() - started_at
-            rate = i / elapsed if elapsed > 0 else 0.0
-            remaining = (total - i) / rate if rate > 0 else 0.0
-            print(
-                f"Progress {i}/{total} ({(i/total)*100:.1f}%) "
-                f"done={done} skipped={skipped} "
-                f"elapsed={elapsed/60:.1f}m eta={remaining/60:.1f}m",
-                flush=True,
-            )
-
+    executor = None
+    if args.workers > 1 and total > 1:
+        executor = ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker)
+        results = executor.map(
+            _run_task,
+            repeat(args.task),
+            html_files,
+            repeat(filing_dir),
+            repeat(args.overwrite),
+        )
+    else:
+        results = _run_sequential(args.task, html_files, filing_dir, args.overwrite)
+
+    try:
+        for i, out in enumerate(results, start=1):
+            if out:
+                done += 1
+            else:
+                skipped += 1
+            if total > 0 and (i == 1 or i % max(args.progress_every, 1) == 0 or i == total):
+                elapsed = time.time() - started_at
+                rate = i / elapsed if elapsed > 0 else 0.0
+                remaining = (total - i) / rate if rate > 0 else 0.0
+                print(
+                    f"Progress {i}/{total} ({(i/total)*100:.1f}%) "
+                    f"done={done} skipped={skipped} "
+                    f"elapsed={elapsed/60:.1f}m eta={remaining/60:.1f}m",
+                    flush=True,
+                )
+    finally:
+        # Also runs on errors and Ctrl-C so queued filings are not left running.
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
     print(f"Completed. done={done} skipped={skipped}")
 
 
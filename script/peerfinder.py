@@ -14,25 +14,71 @@ Scope choices:
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+import hashlib
 import json
 import math
+import os
 import re
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 try:
     import faiss  # type: ignore
 except Exception as exc:
     raise RuntimeError("faiss is required for peerfinder. Install faiss-cpu or faiss-gpu.") from exc
 
+try:
+    import orjson  # type: ignore
+    _HAS_ORJSON = True
+except Exception:
+    _HAS_ORJSON = False
+
+_WS_RE = re.compile(r"\s+")
+
+
+def _ollama_session() -> requests.Session:
+    # One keep-alive pool for every generate call; busy servers (503) are
+    # retried with backoff, but timeouts are not since they already waited.
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        read=False,
+        backoff_factor=1.0,
+        status_forcelist=(503,),
+        allowed_methods=frozenset(["POST"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_maxsize=32, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_OLLAMA_SESSION = _ollama_session()
+
 
 def normalize_item_id(item: str) -> str:
-    return re.sub(r"\s+", "", item.strip().upper())
+    return _WS_RE.sub("", item.strip().upper())
+
+
+def _read_json(path: Path) -> Any:
+    data = path.read_bytes()
+    if _HAS_ORJSON:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
 
 
 def _resolve_scope_dir(vdb_dir: Path, scope: str) -> Path:
@@ -41,8 +87,9 @@ def _resolve_scope_dir(vdb_dir: Path, scope: str) -> Path:
 
 
 def load_pooled(path: Path) -> Tuple[np.ndarray, np.ndarray]:
+    # Rows are L2-normalized float32 at build time, so inner product is cosine.
     data = np.load(path, allow_pickle=False)
-    return data["mat"].astype(np.float32), data["ids"].astype(str)
+    return np.ascontiguousarray(data["mat"], dtype=np.float32), data["ids"].astype(str)
 
 
 def load_item_vectors(vdb_dir: Path, year: int, scope: str) -> pd.DataFrame:
@@ -53,12 +100,26 @@ def load_item_vectors(vdb_dir: Path, year: int, scope: str) -> pd.DataFrame:
     return pd.read_parquet(path)
 
 
+@lru_cache(maxsize=64)
+def _read_faiss_index(idx_dir: str) -> Tuple["faiss.Index", np.ndarray]:
+    # Indices are only searched, never modified, so one loaded copy is shared
+    # by every query for the same item/year in this process.
+    index = faiss.read_index(str(Path(idx_dir) / "pooled.faiss"))
+    ids = np.array(_read_json(Path(idx_dir) / "pooled_ids.json"), dtype=str)
+    return index, ids
+
+
+@lru_cache(maxsize=64)
+def _read_pooled_ids(pooled_path: str) -> np.ndarray:
+    # NpzFile members are read lazily, so this leaves "mat" compressed.
+    with np.load(pooled_path) as data:
+        return data["ids"].astype(str)
+
+
 def load_faiss_index(vdb_dir: Path, scope: str, item_id: str, year: int) -> Tuple["faiss.Index", np.ndarray]:
     scope_dir = _resolve_scope_dir(vdb_dir, scope)
     idx_dir = scope_dir / "indices" / f"item={item_id}" / f"year={year}"
-    index = faiss.read_index(str(idx_dir / "pooled.faiss"))
-    ids = np.array(json.loads((idx_dir / "pooled_ids.json").read_text(encoding="utf-8")), dtype=str)
-    return index, ids
+    return _read_faiss_index(str(idx_dir))
 
 
 def get_similarity_candidates(
@@ -69,56 +130,67 @@ def get_similarity_candidates(
     focal_firm: str,
     q_share: float,
 ) -> Tuple[List[Tuple[str, float]], int]:
+    # The saved FAISS index holds the same rows as the pooled matrix, so the
+    # compressed matrix is only decompressed when the index is missing or its
+    # ids no longer match the pooled .npz (e.g. left over from an older run).
     scope_dir = _resolve_scope_dir(vdb_dir, scope)
     pooled_path = scope_dir / "vectors" / "pooled" / f"item={item_id}" / f"year={year}.npz"
-    mat, firm_ids = load_pooled(pooled_path)
-    matches = np.where(firm_ids == str(focal_firm))[0]
-    if matches.size == 0:
-        raise RuntimeError(f"Focal firm {focal_firm} not found for item={item_id}, year={year}")
-    focal_idx = int(matches[0])
-    n = int(mat.shape[0])
-    k = min(n, max(2, int(math.ceil(n * q_share)) + 1))
-
+    index = None
+    query = None
     try:
-        index, idx_ids = load_faiss_index(vdb_dir, scope, item_id, year)
-        if list(idx_ids) != list(firm_ids):
-            index = faiss.IndexFlatIP(mat.shape[1])
-            index.add(mat.astype(np.float32))
+        index, firm_ids = load_faiss_index(vdb_dir, scope, item_id, year)
+        pooled_ids = _read_pooled_ids(str(pooled_path))
+        if int(index.ntotal) == len(firm_ids) and np.array_equal(firm_ids, pooled_ids):
+            matches = np.flatnonzero(firm_ids == str(focal_firm))
+            if matches.size:
+                query = index.reconstruct(int(matches[0])).reshape(1, -1)
     except Exception:
-        index = faiss.IndexFlatIP(mat.shape[1])
-        index.add(mat.astype(np.float32))
+        query = None
+
+    if query is None:
+        mat, pooled_ids = load_pooled(pooled_path)
+        matches = np.where(pooled_ids == str(focal_firm))[0]
+        if matches.size == 0:
+            raise RuntimeError(f"Focal firm {focal_firm} not found for item={item_id}, year={year}")
+        focal_idx = int(matches[0])
+        query = mat[focal_idx : focal_idx + 1]
+        if index is None or int(index.ntotal) != len(pooled_ids) or list(firm_ids) != list(pooled_ids):
+            index = faiss.IndexFlatIP(mat.shape[1])
+            index.add(mat)
+        firm_ids = pooled_ids
 
-    scores, ids = index.search(mat[focal_idx].reshape(1, -1).astype(np.float32), k)
-    rows: List[Tuple[str, float]] = []
-    for idx, score in zip(ids[0], scores[0]):
-        if int(idx) < 0:
-            continue
-        peer_id = str(firm_ids[int(idx)])
-        if peer_id == str(focal_firm):
-            continue
-        rows.append((peer_id, float(score)))
+    n = int(index.ntotal)
+    k = min(n, max(2, int(math.ceil(n * q_share)) + 1))
+    scores, ids = index.search(query, k)
+    hit_ids = ids[0]
+    keep = hit_ids >= 0
+    peer_ids = firm_ids[np.where(keep, hit_ids, 0)]
+    keep &= peer_ids != str(focal_firm)
+    rows = list(zip(peer_ids[keep].tolist(), scores[0][keep].tolist()))
     return rows, n
 
 
 def _collect_node_values(node: object, field: str, out: List[str]) -> None:
-    if isinstance(node, dict):
-        value = node.get(field)
-        if isinstance(value, str):
-            value = value.strip()
-            if value:
-                out.append(value)
-        children = node.get("children")
-        if isinstance(children, list):
-            for child in children:
-                _collect_node_values(child, field, out)
-    elif isinstance(node, list):
-        for child in node:
-            _collect_node_values(child, field, out)
+    # Pre-order walk with an explicit stack (children pushed in reverse).
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            value = node.get(field)
+            if isinstance(value, str):
+                value = value.strip()
+                if value:
+                    out.append(value)
+            children = node.get("children")
+            if isinstance(children, list):
+                stack.extend(reversed(children))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
 
 
 def load_item_text(source_path: str, item_id: str, scope: str) -> str:
     path = Path(source_path)
-    payload = json.loads(path.read_text(encoding="utf-8"))
+    payload = _read_json(path)
     item_id = normalize_item_id(item_id)
 
     if scope == "summary":
@@ -148,7 +220,7 @@ def load_item_text(source_path: str, item_id: str, scope: str) -> str:
 
 
 def truncate_text(text: str, max_chars: int) -> str:
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _WS_RE.sub(" ", text).strip()
     if len(text) <= max_chars:
         return text
     head = max_chars // 2
@@ -185,7 +257,7 @@ def ollama_rerank(
     prompt: str,
     timeout_sec: int,
 ) -> Tuple[float, str]:
-    resp = requests.post(
+    resp = _OLLAMA_SESSION.post(
         base_url.rstrip("/") + "/api/generate",
         json={
             "model": model,
@@ -211,6 +283,32 @@ def ollama_rerank(
     return score / 100.0, reason
 
 
+def cached_rerank(
+    cache_dir: Optional[Path],
+    base_url: str,
+    model: str,
+    prompt: str,
+    timeout_sec: int,
+) -> Tuple[float, str]:
+    # Reranking runs at temperature 0, so a (model, prompt) pair always maps to
+    # the same answer; repeat queries are served from disk.
+    if cache_dir is None:
+        return ollama_rerank(base_url=base_url, model=model, prompt=prompt, timeout_sec=timeout_sec)
+    key = hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+    path = cache_dir / key[:2] / f"{key}.json"
+    try:
+        payload = _read_json(path)
+        return float(payload["score"]), str(payload["reason"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    score, reason = ollama_rerank(base_url=base_url, model=model, prompt=prompt, timeout_sec=timeout_sec)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_text(json.dumps({"score": score, "reason": reason}), encoding="utf-8")
+    os.replace(tmp_path, path)
+    return score, reason
+
+
 def write_table(df: pd.DataFrame, path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     lower = path.name.lower()
@@ -232,12 +330,23 @@ def run_peerfinder(
     timeout_sec: int,
     ollama_url: str,
     max_chars: int,
+    rerank_cache_dir: Optional[Path] = None,
+    rerank_workers: int = 1,
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
     items_df = load_item_vectors(vdb_dir, year, scope)
     item_set = {normalize_item_id(x) for x in items}
     detail_rows: List[Dict[str, object]] = []
     universe_sizes: List[int] = []
 
+    def rerank(prompt: str) -> Tuple[float, str]:
+        return cached_rerank(
+            cache_dir=rerank_cache_dir,
+            base_url=ollama_url,
+            model=model,
+            prompt=prompt,
+            timeout_sec=timeout_sec,
+        )
+
     for item_id in item_set:
         sub = items_df[(items_df["item_id"] == item_id) & (items_df["year"] == int(year))]
         if sub.empty:
@@ -251,14 +360,16 @@ def run_peerfinder(
         if not candidates:
             continue
 
-        source_by_firm = {
-            str(row["firm_id"]): str(row["source_path"])
-            for _, row in sub[["firm_id", "source_path"]].drop_duplicates().iterrows()
-        }
+        sources = sub[["firm_id", "source_path"]].drop_duplicates()
+        source_by_firm = dict(
+            zip(sources["firm_id"].astype(str).tolist(), sources["source_path"].astype(str).tolist())
+        )
         focal_text = truncate_text(load_item_text(source_by_firm[str(focal_firm)], item_id, scope), max_chars)
         if not focal_text:
             continue
 
+        pairs: List[Tuple[str, float]] = []
+        prompts: List[str] = []
         for peer_id, cosine_score in candidates:
             peer_path = source_by_firm.get(str(peer_id))
             if not peer_path:
@@ -266,12 +377,16 @@ def run_peerfinder(
             peer_text = truncate_text(load_item_text(peer_path, item_id, scope), max_chars)
             if not peer_text:
                 continue
-            rerank_score, reason = ollama_rerank(
-                base_url=ollama_url,
-                model=model,
-                prompt=rerank_prompt(item_id, scope, focal_text, peer_text),
-                timeout_sec=timeout_sec,
-            )
+            pairs.append((peer_id, cosine_score))
+            prompts.append(rerank_prompt(item_id, scope, focal_text, peer_text))
+
+        # Rerank calls are independent HTTP round-trips; map keeps candidate order.
+        if rerank_workers > 1 and len(prompts) > 1:
+            with ThreadPoolExecutor(max_workers=rerank_workers) as executor:
+                results = list(executor.map(rerank, prompts))
+        else:
+            results = [rerank(prompt) for prompt in prompts]
+        for (peer_id, cosine_score), (rerank_score, reason) in zip(pairs, results):
             combined = 0.3 * float(cosine_score) + 0.7 * rerank_score
             detail_rows.append(
                 {
@@ -304,12 +419,12 @@ def run_peerfinder(
     )
     agg["coverage_share"] = agg["items_matched"] / requested_items
     agg["final_score"] = agg["avg_item_score"] * agg["coverage_share"]
-    agg = agg.sort_values(["final_score", "avg_rerank", "avg_cosine"], ascending=False).reset_index(drop=True)
-    agg["rank"] = np.arange(1, len(agg) + 1)
 
     universe_n = max(universe_sizes) if universe_sizes else len(agg) + 1
     final_k = max(1, int(math.ceil(universe_n * top_share)))
-    final_df = agg.head(final_k).copy()
+    # Only the top final_k rows are kept, so select them without sorting all peers.
+    final_df = agg.nlargest(final_k, ["final_score", "avg_rerank", "avg_cosine"]).reset_index(drop=True)
+    final_df["rank"] = np.arange(1, len(final_df) + 1)
     return final_df, detail_df
 
 
@@ -326,6 +441,18 @@ def main() -> None:
     parser.add_argument("--timeout", type=int, default=300, help="LLM timeout in seconds")
     parser.add_argument("--ollama-url", default="http://localhost:11434", help="Base URL for local Ollama")
     parser.add_argument("--max-chars", type=int, default=12000, help="Max chars of item text sent to the LLM")
+    parser.add_argument(
+        "--rerank-workers",
+        type=int,
+        default=1,
+        help="Concurrent reranker requests; raise together with OLLAMA_NUM_PARALLEL on the server.",
+    )
+    parser.add_argument(
+        "--no-rerank-cache",
+        dest="rerank_cache",
+        action="store_false",
+        help="Always call the reranker instead of reusing cached scores under <vdb_dir>/_rerank_cache.",
+    )
     parser.add_argument(
         "--out_path",
         default="output/peer_sets_{timestamp}.csv",
@@ -335,8 +462,9 @@ def main() -> None:
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     out_path = Path(str(args.out_path).format(timestamp=timestamp))
+    vdb_dir = Path(args.vdb_dir)
     final_df, detail_df = run_peerfinder(
-        vdb_dir=Path(args.vdb_dir),
+        vdb_dir=vdb_dir,
         focal_firm=str(args.focalfirm),
         year=int(args.year),
         items=[normalize_item_id(x) for x in args.item],
@@ -347,6 +475,8 @@ def main() -> None:
         timeout_sec=int(args.timeout),
         ollama_url=str(args.ollama_url),
         max_chars=int(args.max_chars),
+        rerank_cache_dir=(vdb_dir / "_rerank_cache") if args.rerank_cache else None,
+        rerank_workers=max(1, int(args.rerank_workers)),
     )
     write_table(final_df, out_path)
     detail_path = out_path.with_name(out_path.stem + "_detail" + out_path.suffix)
@@ -17,9 +17,11 @@ import math
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 try:
     import tiktoken  # type: ignore
@@ -27,6 +29,36 @@ try:
 except Exception:
     _HAS_TIKTOKEN = False
 
+try:
+    import orjson  # type: ignore
+    _HAS_ORJSON = True
+except Exception:
+    _HAS_ORJSON = False
+
+_WS_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"\S+")
+
+
+def _ollama_session() -> requests.Session:
+    # One keep-alive pool for every generate call; busy servers (503) are
+    # retried with backoff, but timeouts are not since they already waited.
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        read=False,
+        backoff_factor=1.0,
+        status_forcelist=(503,),
+        allowed_methods=frozenset(["POST"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_maxsize=32, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_OLLAMA_SESSION = _ollama_session()
+
 
 DEFAULT_ITEMS = [
     "1", "1A", "1B", "1C", "2", "3", "4", "5", "6", "7", "7A", "8", "9", "9A", "9B", "9C",
@@ -46,15 +78,25 @@ class TokenCounter:
     def count(self, text: str) -> int:
         if self._enc is not None:
             return len(self._enc.encode(text))
-        return len(re.findall(r"\S+", text))
+        return len(_TOKEN_RE.findall(text))
 
 
 def normalize_item_id(item: str) -> str:
-    return re.sub(r"\s+", "", item.strip().upper())
+    return _WS_RE.sub("", item.strip().upper())
+
+
+def _read_json(path: Path) -> Any:
+    data = path.read_bytes()
+    if _HAS_ORJSON:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
 
 
 def extract_text(s: str) -> str:
-    return re.sub(r"\s+", " ", s).strip()
+    return _WS_RE.sub(" ", s).strip()
 
 
 def infer_firm_year_from_path(path: Path, filing_dir: Path, filing_type: str) -> Tuple[str, int]:
@@ -74,7 +116,7 @@ def list_item_files(filing_dir: Path, filing_type: str) -> List[Path]:
 
 
 def load_items_from_json(path: Path, allowed_items: Sequence[str]) -> Dict[str, str]:
-    payload = json.loads(path.read_text(encoding="utf-8"))
+    payload = _read_json(path)
     toc_items = payload.get("toc_items")
     items = payload.get("items")
     if not isinstance(toc_items, dict) or not isinstance(items, dict):
@@ -167,7 +209,7 @@ Target about {target_words} words.
 
 def ollama_generate(base_url: str, model: str, prompt: str, timeout_sec: int) -> str:
     url = base_url.rstrip("/") + "/api/generate"
-    resp = requests.post(
+    resp = _OLLAMA_SESSION.post(
         url,
         json={
             "model": model,
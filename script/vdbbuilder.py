@@ -29,7 +29,7 @@ import re
 import shutil
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
@@ -46,6 +46,15 @@ try:
 except Exception:
     _HAS_TIKTOKEN = False
 
+try:
+    import orjson  # type: ignore
+    _HAS_ORJSON = True
+except Exception:
+    _HAS_ORJSON = False
+
+_WS_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"\S+")
+
 
 DEFAULT_ITEMS = [
     "1", "1A", "1B", "1C", "2", "3", "4", "5", "6", "7", "7A", "8", "9", "9A", "9B", "9C",
@@ -53,6 +62,11 @@ DEFAULT_ITEMS = [
 ]
 DEFAULT_EMBED_MODEL = "BAAI/bge-m3"
 DEFAULT_WEIGHT_EPS = 1e-6
+# Stored FAISS index encodings: exact float32 rows ("flat"), 8-bit scalar
+# quantized rows ("sq8", 4x smaller, approximate inner products) or float16
+# rows ("fp16", 2x smaller, near-exact inner products).
+FAISS_INDEX_TYPES = ("flat", "sq8", "fp16")
+_FAISS_SQ_TYPES = {"sq8": "QT_8bit", "fp16": "QT_fp16"}
 
 # Tuned from observed item length statistics supplied for 10-K items.
 ITEM_DEFAULT_CHUNK_TOKENS: Dict[str, int] = {
@@ -120,11 +134,27 @@ class TokenCounter:
     def count(self, text: str) -> int:
         if self._enc is not None:
             return len(self._enc.encode(text))
-        return len(re.findall(r"\S+", text))
+        return len(_TOKEN_RE.findall(text))
 
 
 def normalize_item_id(item: str) -> str:
-    return re.sub(r"\s+", "", item.strip().upper())
+    return _WS_RE.sub("", item.strip().upper())
+
+
+def _read_json(path: Path) -> Any:
+    data = path.read_bytes()
+    if _HAS_ORJSON:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def _dump_json(value: Any) -> str:
+    if _HAS_ORJSON:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value)
 
 
 def resolve_chunk_tokens(item_id: str, override: Optional[int]) -> int:
@@ -149,7 +179,7 @@ def canonicalize_text(text: str) -> str:
 
 
 def tokenize(text: str) -> List[str]:
-    return re.findall(r"\S+", text)
+    return _TOKEN_RE.findall(text)
 
 
 def chunk_by_tokens(
@@ -211,8 +241,9 @@ def distinctiveness_weighted_pool(
     weights = np.linalg.norm(unit_vecs - centroid[None, :], axis=1) + eps
     cap = np.percentile(weights, cap_percentile)
     weights = np.minimum(weights, cap)
-    pooled = (weights[:, None] * unit_vecs).sum(axis=0) / (weights.sum() + 1e-12)
-    pooled = pooled.astype(np.float32)
+    # Weighted sum as one GEMV instead of materializing an N x D weighted copy.
+    pooled = np.matmul(weights.astype(np.float32, copy=False), unit_vecs)
+    pooled /= weights.sum() + 1e-12
     pooled /= np.linalg.norm(pooled) + 1e-12
     return pooled, {"w_max": float(weights.max()), "w_mean": float(weights.mean())}
 
@@ -220,7 +251,7 @@ def distinctiveness_weighted_pool(
 def extract_text(s: str) -> str:
     soup = BeautifulSoup(s, "lxml")
     text = soup.get_text(separator=" ")
-    return re.sub(r"\s+", " ", text).strip()
+    return _WS_RE.sub(" ", text).strip()
 
 
 def infer_firm_year_from_path(path: Path, filing_dir: Path, filing_type: str) -> Tuple[str, int]:
@@ -252,7 +283,7 @@ def list_filing_files(filing_dir: Path, filing_type: str, scope: str) -> List[Pa
 
 
 def load_items_from_json(path: Path, allowed_items: Sequence[str]) -> Dict[str, str]:
-    payload = json.loads(path.read_text(encoding="utf-8"))
+    payload = _read_json(path)
     toc_items = payload.get("toc_items")
     items = payload.get("items")
     if not isinstance(toc_items, dict) or not isinstance(items, dict):
@@ -277,23 +308,25 @@ def load_items_from_json(path: Path, allowed_items: Sequence[str]) -> Dict[str,
 
 
 def _collect_node_values(node: object, field: str, out: List[str]) -> None:
-    if isinstance(node, dict):
-        value = node.get(field)
-        if isinstance(value, str):
-            value = value.strip()
-            if value:
-                out.append(value)
-        children = node.get("children")
-        if isinstance(children, list):
-            for child in children:
-                _collect_node_values(child, field, out)
-    elif isinstance(node, list):
-        for child in node:
-            _collect_node_values(child, field, out)
+    # Pre-order walk with an explicit stack (children pushed in reverse).
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            value = node.get(field)
+            if isinstance(value, str):
+                value = value.strip()
+                if value:
+                    out.append(value)
+            children = node.get("children")
+            if isinstance(children, list):
+                stack.extend(reversed(children))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
 
 
 def load_items_from_struct_json(path: Path, allowed_items: Sequence[str]) -> Dict[str, str]:
-    payload = json.loads(path.read_text(encoding="utf-8"))
+    payload = _read_json(path)
     structures = payload.get("structures")
     if not isinstance(structures, dict):
         return {}
@@ -312,7 +345,7 @@ def load_items_from_struct_json(path: Path, allowed_items: Sequence[str]) -> Dic
 
 
 def load_items_from_summary_json(path: Path, allowed_items: Sequence[str]) -> Dict[str, str]:
-    payload = json.loads(path.read_text(encoding="utf-8"))
+    payload = _read_json(path)
     items = payload.get("items")
     if not isinstance(items, dict):
         return {}
@@ -330,7 +363,7 @@ def load_items_from_summary_json(path: Path, allowed_items: Sequence[str]) -> Di
 
 def save_npz(path: Path, mat: np.ndarray, ids: np.ndarray) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    np.savez_compressed(path, mat=mat.astype(np.float32), ids=np.asarray(ids, dtype=np.str_))
+    np.savez_compressed(path, mat=np.asarray(mat, dtype=np.float32), ids=np.asarray(ids, dtype=np.str_))
 
 
 def _faiss_gpu_available() -> bool:
@@ -352,9 +385,15 @@ def _faiss_to_cpu(index: "faiss.Index") -> "faiss.Index":
     return index
 
 
-def build_faiss_index(mat: np.ndarray, use_gpu: bool = True) -> "faiss.Index":
+def build_faiss_index(mat: np.ndarray, use_gpu: bool = True, index_type: str = "flat") -> "faiss.Index":
+    vecs = np.ascontiguousarray(mat, dtype=np.float32)
+    if index_type in _FAISS_SQ_TYPES:
+        qtype = getattr(faiss.ScalarQuantizer, _FAISS_SQ_TYPES[index_type])
+        sq_index = faiss.IndexScalarQuantizer(mat.shape[1], qtype, faiss.METRIC_INNER_PRODUCT)
+        sq_index.train(vecs)
+        sq_index.add(vecs)
+        return sq_index
     cpu_index = faiss.IndexFlatIP(mat.shape[1])
-    vecs = mat.astype(np.float32)
     if use_gpu and _faiss_gpu_available():
         try:
             gpu_index = faiss.index_cpu_to_all_gpus(cpu_index)
@@ -382,6 +421,7 @@ class BuildConfig:
     min_units_per_item: int
     faiss_use_gpu: bool
     overwrite: bool
+    faiss_index: str = "flat"
 
 
 def build(cfg: BuildConfig) -> None:
@@ -417,6 +457,8 @@ def build(cfg: BuildConfig) -> None:
 
     units_rows: List[Dict[str, object]] = []
     item_rows: List[Dict[str, object]] = []
+    # Pooled vectors kept as arrays parallel to item_rows, stacked once below.
+    pooled_vecs: List[np.ndarray] = []
 
     for idx, path in enumerate(files, start=1):
         try:
@@ -434,21 +476,19 @@ def build(cfg: BuildConfig) -> None:
         if not item_texts:
             continue
 
+        # Prepare every item of the filing first, then embed all of their
+        # texts in one call so the embedder runs full batches.
+        prepared: List[Tuple[str, str, List[str], Optional[int], Optional[int], int]] = []
+        batch_texts: List[str] = []
         for item_id, raw_text in item_texts.items():
             text = canonicalize_text(raw_text)
             if not text:
                 continue
 
             if cfg.scope == "summary":
-                pooled = embedder.embed_texts([text])[0]
-                pooled = pooled.astype(np.float32)
-                pooled /= np.linalg.norm(pooled) + 1e-12
-                num_units = 1
-                item_tokens = token_counter.count(text)
+                units = [text]
                 chunk_tokens = None
                 overlap_tokens = None
-                w_max = 1.0
-                w_mean = 1.0
             else:
                 chunk_tokens = resolve_chunk_tokens(item_id, cfg.chunk_tokens)
                 overlap_tokens = resolve_overlap_tokens(item_id, chunk_tokens, cfg.overlap_tokens)
@@ -462,7 +502,21 @@ def build(cfg: BuildConfig) -> None:
                 units = [unit for unit in units if token_counter.count(unit) >= cfg.min_unit_tokens]
                 if len(units) < cfg.min_units_per_item:
                     continue
-                unit_vecs = embedder.embed_texts(units)
+            prepared.append((item_id, text, units, chunk_tokens, overlap_tokens, len(batch_texts)))
+            batch_texts.extend(units)
+
+        batch_vecs = embedder.embed_texts(batch_texts) if batch_texts else None
+
+        for item_id, text, units, chunk_tokens, overlap_tokens, offset in prepared:
+            unit_vecs = batch_vecs[offset : offset + len(units)]
+            if cfg.scope == "summary":
+                pooled = unit_vecs[0].astype(np.float32)
+                pooled /= np.linalg.norm(pooled) + 1e-12
+                num_units = 1
+                item_tokens = token_counter.count(text)
+                w_max = 1.0
+                w_mean = 1.0
+            else:
                 pooled, stats = distinctiveness_weighted_pool(unit_vecs)
                 num_units = len(units)
                 item_tokens = sum(token_counter.count(unit) for unit in units)
@@ -493,7 +547,7 @@ def build(cfg: BuildConfig) -> None:
                     "embedding_model": cfg.embed_model,
                     "num_units": num_units,
                     "item_tokens": item_tokens,
-                    "pooled_embedding": json.dumps(pooled.astype(float).tolist()),
+                    "pooled_embedding": _dump_json(pooled.astype(float).tolist()),
                     "chunk_tokens": chunk_tokens,
                     "overlap_tokens": overlap_tokens,
                     "w_max": w_max,
@@ -502,6 +556,7 @@ def build(cfg: BuildConfig) -> None:
                     "scope": cfg.scope,
                 }
             )
+            pooled_vecs.append(pooled)
 
         if idx % 100 == 0:
             print(f"[INFO] Processed {idx}/{len(files)} files")
@@ -511,38 +566,33 @@ def build(cfg: BuildConfig) -> None:
         raise RuntimeError("No item vectors built. Check source files and selected items.")
 
     units_df = pd.DataFrame(units_rows)
-    items_df["_row_idx"] = np.arange(len(items_df))
+    all_vecs = np.stack(pooled_vecs).astype(np.float32, copy=False)
+    all_firm_ids = items_df["firm_id"].astype(str).to_numpy()
+    groups = items_df.groupby(["item_id", "year"], sort=True).indices
 
-    for item_id, year in sorted(set((row["item_id"], int(row["year"])) for _, row in items_df.iterrows())):
-        sub = items_df[(items_df["item_id"] == item_id) & (items_df["year"] == year)]
-        idxs = sub["_row_idx"].to_numpy()
+    for (item_id, year), idxs in groups.items():
+        year = int(year)
         if len(idxs) == 0:
             continue
-        mat = np.stack(
-            [
-                np.array(json.loads(items_df.loc[items_df["_row_idx"] == rid, "pooled_embedding"].values[0]), dtype=np.float32)
-                for rid in idxs
-            ],
-            axis=0,
-        )
+        mat = all_vecs[idxs]
+        # Normalize once here; peerfinder scores rows with a plain inner product.
         mat /= np.linalg.norm(mat, axis=1, keepdims=True) + 1e-12
-        firm_ids = sub["firm_id"].astype(str).to_numpy()
+        firm_ids = all_firm_ids[idxs]
 
         pooled_path = scoped_out_dir / "vectors" / "pooled" / f"item={item_id}" / f"year={year}.npz"
         save_npz(pooled_path, mat, firm_ids)
 
         index_dir = scoped_out_dir / "indices" / f"item={item_id}" / f"year={year}"
         index_dir.mkdir(parents=True, exist_ok=True)
-        index = build_faiss_index(mat, use_gpu=cfg.faiss_use_gpu)
+        index = build_faiss_index(mat, use_gpu=cfg.faiss_use_gpu, index_type=cfg.faiss_index)
         faiss.write_index(_faiss_to_cpu(index), str(index_dir / "pooled.faiss"))
-        (index_dir / "pooled_ids.json").write_text(json.dumps(firm_ids.tolist()), encoding="utf-8")
+        (index_dir / "pooled_ids.json").write_text(_dump_json(firm_ids.tolist()), encoding="utf-8")
 
     items_dir = scoped_out_dir / "item_vectors"
     items_dir.mkdir(parents=True, exist_ok=True)
-    items_noidx = items_df.drop(columns=["_row_idx"])
-    for year in sorted(set(int(y) for y in items_noidx["year"].tolist())):
+    for year in sorted(set(int(y) for y in items_df["year"].tolist())):
         out_path = items_dir / f"item_vectors_{year}.parquet"
-        items_noidx[items_noidx["year"] == year].to_parquet(out_path, index=False)
+        items_df[items_df["year"] == year].to_parquet(out_path, index=False)
         print(f"[DONE] Wrote: {out_path}")
 
     if not units_df.empty:
@@ -607,6 +657,12 @@ def main() -> None:
         help="Use FAISS GPU acceleration when available (default: on).",
     )
     parser.add_argument("--no-faiss-gpu", dest="faiss_use_gpu", action="store_false")
+    parser.add_argument(
+        "--faiss-index",
+        default="flat",
+        choices=FAISS_INDEX_TYPES,
+        help="Stored index encoding: exact float32 (flat), 8-bit scalar quantized (sq8) or float16 (fp16); sq8/fp16 are CPU only.",
+    )
     parser.add_argument(
         "--overwrite",
         action="store_true",
@@ -629,6 +685,7 @@ def main() -> None:
         min_units_per_item=int(args.min_units_per_item),
         faiss_use_gpu=bool(args.faiss_use_gpu),
         overwrite=bool(args.overwrite),
+        faiss_index=str(args.faiss_index),
     )
     build(cfg)
 
@@ -7,12 +7,14 @@ import os
 # SEC EDGAR API Settings
 SEC_BASE_URL = "https://www.sec.gov"
 SEC_ARCHIVES_URL = f"{SEC_BASE_URL}/cgi-bin/browse-edgar"
+SEC_DATA_URL = "https://data.sec.gov"
 SEC_USER_AGENT = "RAG4PeerFirm/1.0 (Research Tool; yourname@yourdomain.com)"  # IMPORTANT: Update with your email
 
 # File Paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 SEC_FILINGS_DIR = os.path.join(BASE_DIR, "sec_filings")
 LOGS_DIR = os.path.join(BASE_DIR, "logs")
+CACHE_DIR = os.path.join(BASE_DIR, ".cache")
 
 # Filing Types
 SUPPORTED_FILING_TYPES = ["10-K", "10-Q"]
@@ -52,9 +54,16 @@ ITEMS_10Q = {
     "4": "Controls and Procedures",
 }
 
+# Precomputed item key sets for membership checks
+ITEMS_10K_SET = frozenset(ITEMS_10K)
+ITEMS_10Q_SET = frozenset(ITEMS_10Q)
+
 # Request Settings
 REQUEST_TIMEOUT = 30  # seconds
 REQUEST_DELAY = 0.1  # SEC recommends no more than 10 requests per second
+REQUEST_BURST = 10  # Max back-to-back requests before the average rate applies
+HTTP_POOL_MAXSIZE = 16  # Keep-alive connections kept per host (>= download workers)
+HTTP_MAX_RETRIES = 3  # Retries on connection errors and 5xx responses
 
 # Logging
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -5,11 +5,55 @@ SEC EDGAR Downloader - Fetches filings from SEC EDGAR
 import requests
 import time
 import re
-from typing import Optional, Tuple
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+from lxml import etree, html as lxml_html
 from utils.config import (
-    SEC_BASE_URL, SEC_USER_AGENT, REQUEST_TIMEOUT, REQUEST_DELAY
+    SEC_BASE_URL, SEC_DATA_URL, SEC_USER_AGENT, REQUEST_TIMEOUT, REQUEST_DELAY
 )
+from utils.rate_limiter import SEC_RATE_LIMITER
+from utils.ticker_cache import TickerCache
+from utils.http_cache import create_sec_session
+
+STREAM_CHUNK_SIZE = 1024 * 1024
+_ATOM_PARSER = etree.XMLParser(recover=True, resolve_entities=False, no_network=True)
+
+
+def _element_text(element) -> str:
+    """Concatenated descendant text of an element, like BeautifulSoup's .text"""
+    return ''.join(element.itertext())
+
+
+def _index_table_rows(content: bytes, table_classes: Tuple[str, ...]) -> Optional[List[list]]:
+    """
+    Parse a filing index page and return the <td> cells of each data row
+    of the first table carrying one of the given classes.
+
+    Args:
+        content: Raw index page bytes
+        table_classes: Table classes to try, in order of preference
+
+    Returns:
+        List of per-row cell lists (header row skipped) or None if no table matched
+    """
+    doc = lxml_html.fromstring(content)
+    for table_class in table_classes:
+        tables = doc.xpath(
+            "//table[contains(concat(' ', normalize-space(@class), ' '), $cls)]",
+            cls=f" {table_class} ",
+        )
+        if tables:
+            rows = tables[0].xpath('.//tr')[1:]  # Skip header
+            return [row.xpath('.//td') for row in rows]
+    return None
+
+
+def _document_href(cell) -> Optional[str]:
+    """Return the href of the first link in a table cell, if any"""
+    link = cell.find('.//a')
+    if link is None:
+        return None
+    return link.get('href') or None
 
 
 class SECDownloader:
@@ -23,9 +67,21 @@ class SECDownloader:
             user_agent: User agent string for SEC requests
         """
         self.user_agent = user_agent
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': user_agent})
-    
+        # Process-wide SEC request budget, shared across threads and clients;
+        # the sessions take a token per network request (not per cache hit).
+        self.rate_limiter = SEC_RATE_LIMITER
+        self.session = create_sec_session(user_agent, rate_limiter=self.rate_limiter)
+        # Document downloads stream straight to disk; a cached session would
+        # buffer each body in memory and keep a second copy in the cache.
+        self.stream_session = create_sec_session(
+            user_agent, use_cache=False, rate_limiter=self.rate_limiter
+        )
+        self.ticker_cache = TickerCache(self.session)
+        # Resolved document URLs; filings are immutable once published
+        self._filing_url_cache: Dict[Tuple[str, str, str], str] = {}
+        self._accession_url_cache: Dict[Tuple[str, str], str] = {}
+        self._submissions_cache: Dict[str, Optional[dict]] = {}
+
     def _get_cik_from_ticker(self, ticker: str) -> Optional[str]:
         """
         Get CIK number from ticker symbol
@@ -37,20 +93,7 @@ class SECDownloader:
             CIK number (padded to 10 digits) or None if not found
         """
         try:
-            # Use SEC's company tickers JSON endpoint
-            url = f"{SEC_BASE_URL}/files/company_tickers.json"
-            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            
-            data = response.json()
-            ticker_upper = ticker.upper()
-            
-            for entry in data.values():
-                if entry.get('ticker', '').upper() == ticker_upper:
-                    cik = str(entry['cik_str']).zfill(10)
-                    return cik
-            
-            return None
+            return self.ticker_cache.get(ticker)
         except Exception as e:
             raise Exception(f"Failed to resolve ticker {ticker}: {str(e)}")
     
@@ -100,10 +143,86 @@ class SECDownloader:
         Returns:
             URL of the filing HTML document or None if not found
         """
+        key = (cik, filing_type, str(year))
+        url = self._filing_url_cache.get(key)
+        if url is None:
+            url = self._get_filing_url_from_submissions(cik, filing_type, str(year))
+        if url is None:
+            url = self._lookup_filing_url(cik, filing_type, str(year))
+            # Misses are not cached; they may stem from a transient error
+            if url is not None:
+                self._filing_url_cache[key] = url
+        return url
+
+    def _get_recent_submissions(self, cik: str) -> Optional[dict]:
+        """
+        Fetch the recent-filings block of a company's submissions JSON
+
+        Args:
+            cik: CIK number (10 digits)
+
+        Returns:
+            The filings.recent dict of parallel arrays, or None if unavailable
+        """
+        if cik in self._submissions_cache:
+            return self._submissions_cache[cik]
+        try:
+            response = self.session.get(
+                f"{SEC_DATA_URL}/submissions/CIK{cik}.json", timeout=REQUEST_TIMEOUT
+            )
+            if response.status_code == 404:
+                # Definitive: SEC has no submissions file for this CIK
+                self._submissions_cache[cik] = None
+                return None
+            if response.status_code != 200:
+                return None
+            recent = response.json().get('filings', {}).get('recent')
+        except (requests.RequestException, ValueError):
+            # Transient failures are not cached, matching _get_filing_url
+            return None
+        self._submissions_cache[cik] = recent
+        return recent
+
+    def _get_filing_url_from_submissions(self, cik: str, filing_type: str,
+                                         year: str) -> Optional[str]:
+        """
+        Resolve the filing document URL from the submissions JSON
+
+        One request per company replaces the browse-edgar search and index
+        page fetch. Only the recent-filings window is consulted; older
+        filings fall back to _lookup_filing_url.
+
+        Args:
+            cik: CIK number (10 digits)
+            filing_type: Type of filing (10-K or 10-Q)
+            year: Filing year
+
+        Returns:
+            URL of the primary document, or None if not found
+        """
+        recent = self._get_recent_submissions(cik)
+        if not recent:
+            return None
+        forms = recent.get('form') or []
+        dates = recent.get('filingDate') or []
+        accessions = recent.get('accessionNumber') or []
+        documents = recent.get('primaryDocument') or []
+        cik_archive = str(int(cik)) if cik.isdigit() else cik.lstrip('0')
+
+        # Newest first, like the browse-edgar feed; amendments have form "<type>/A"
+        for form, filing_date, accession, document in zip(forms, dates, accessions, documents):
+            if form != filing_type or not filing_date.startswith(year):
+                continue
+            if 'htm' not in document:
+                continue
+            accession_path = accession.replace('-', '')
+            return f"{SEC_BASE_URL}/Archives/edgar/data/{cik_archive}/{accession_path}/{document}"
+        return None
+
+    def _lookup_filing_url(self, cik: str, filing_type: str, year: str) -> Optional[str]:
+        """Uncached body of _get_filing_url"""
         try:
             year = str(year)
-            # Search for filings using JSON endpoint (more reliable)
-            search_url = f"{SEC_BASE_URL}/files/company_tickers.json"
             
             # First, get the company's recent filings
             browse_url = f"{SEC_BASE_URL}/cgi-bin/browse-edgar"
@@ -116,15 +235,14 @@ class SECDownloader:
                 'count': '100'
             }
             
-            time.sleep(REQUEST_DELAY)
             response = self.session.get(browse_url, params=params, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             
             # Parse XML/Atom response
-            soup = BeautifulSoup(response.content, 'lxml-xml')
+            feed = etree.fromstring(response.content, _ATOM_PARSER)
             
             # Find entries (filings)
-            entries = soup.find_all('entry')
+            entries = list(feed.iter('{*}entry')) if feed is not None else []
             if not entries:
                 raise Exception(f"No filings found for CIK {cik}")
             
@@ -133,20 +251,20 @@ class SECDownloader:
             filings_from_year = []
             
             for entry in entries:
-                filing_date_elem = entry.find('filing-date')
-                if not filing_date_elem:
+                filing_date_elem = entry.find('.//{*}filing-date')
+                if filing_date_elem is None:
                     continue
                     
-                filing_date = filing_date_elem.text
+                filing_date = _element_text(filing_date_elem)
                 
                 # Check if filing is from the specified year
                 if filing_date.startswith(year):
                     # Get the accession number
-                    accession_elem = entry.find('accession-number')
-                    if not accession_elem:
+                    accession_elem = entry.find('.//{*}accession-number')
+                    if accession_elem is None:
                         continue
                     
-                    accession_formatted = accession_elem.text  # Format: 0001193125-23-123456
+                    accession_formatted = _element_text(accession_elem)  # Format: 0001193125-23-123456
                     accession_path = accession_formatted.replace('-', '')  # Remove dashes for path
                     
                     filings_from_year.append((accession_formatted, accession_path, filing_date))
@@ -163,26 +281,20 @@ class SECDownloader:
                     # https://www.sec.gov/Archives/edgar/{CIK}/{accession_no_dashes}/{accession_no_with_dashes}-index.html
                     doc_index_url = f"{SEC_BASE_URL}/Archives/edgar/data/{cik_archive}/{accession_path}/{accession_formatted}-index.html"
                     
-                    time.sleep(REQUEST_DELAY)
                     try:
                         doc_response = self.session.get(doc_index_url, timeout=REQUEST_TIMEOUT)
                         
                         if doc_response.status_code == 200:
                             # Parse the index to find the main document
-                            doc_soup = BeautifulSoup(doc_response.content, 'html.parser')
-                            
-                            # Look for the main filing document (usually .htm or .html)
-                            table = doc_soup.find('table', class_='tableFile')
-                            if table:
-                                rows = table.find_all('tr')[1:]  # Skip header
-                                
+                            # (usually .htm or .html)
+                            rows = _index_table_rows(doc_response.content, ('tableFile',))
+                            if rows is not None:
                                 # Check if this is an amendment - skip amended filings
                                 # Look at document types to see if this is an amendment version
                                 is_amendment = False
-                                for row in rows:
-                                    cols = row.find_all('td')
+                                for cols in rows:
                                     if len(cols) >= 4:
-                                        doc_type = cols[3].text.strip()
+                                        doc_type = _element_text(cols[3]).strip()
                                         # Skip if document type indicates amendment (e.g., "10-K/A", "10-Q/A", etc.)
                                         if '/A' in doc_type:
                                             is_amendment = True
@@ -194,18 +306,16 @@ class SECDownloader:
                                 
                                 # The main filing is typically sequence 1 with type matching filing_type
                                 # Look for first HTML file in sequence 1 or 2
-                                for row in rows:
-                                    cols = row.find_all('td')
+                                for cols in rows:
                                     if len(cols) >= 4:
-                                        sequence = cols[0].text.strip()
-                                        filename = cols[2].text.strip()
-                                        doc_type = cols[3].text.strip()
+                                        sequence = _element_text(cols[0]).strip()
+                                        filename = _element_text(cols[2]).strip()
+                                        doc_type = _element_text(cols[3]).strip()
                                         
                                         # Main filing is usually sequence 1
                                         if sequence == '1' and (filename.endswith('.htm') or filename.endswith('.html') or 'htm' in filename):
-                                            link = cols[2].find('a')
-                                            if link and link.get('href'):
-                                                href = link['href']
+                                            href = _document_href(cols[2])
+                                            if href:
                                                 # Handle iXBRL viewer links: /ix?doc=/Archives/edgar/...
                                                 if '/ix?doc=' in href:
                                                     # Extract the actual document path from the iXBRL viewer URL
@@ -233,6 +343,11 @@ class SECDownloader:
         Returns:
             URL to the filing HTML/HTM document, or None if not found.
         """
+        key = (cik, accession_formatted)
+        cached = self._accession_url_cache.get(key)
+        if cached is not None:
+            return cached
+
         accession_path = accession_formatted.replace('-', '')
         cik_archive = str(int(cik)) if cik.isdigit() else cik.lstrip('0')
         doc_index_url = (
@@ -242,7 +357,9 @@ class SECDownloader:
 
         doc_response = None
         for attempt in range(5):
-            time.sleep(max(1.0, REQUEST_DELAY * (attempt + 1) * 5))
+            if attempt:
+                # Back off only after a 429; normal pacing is the rate limiter's job
+                time.sleep(max(1.0, REQUEST_DELAY * (attempt + 1) * 5))
             doc_response = self.session.get(doc_index_url, timeout=REQUEST_TIMEOUT)
             if doc_response.status_code == 200:
                 break
@@ -252,33 +369,31 @@ class SECDownloader:
         if doc_response is None or doc_response.status_code != 200:
             return None
 
-        doc_soup = BeautifulSoup(doc_response.content, 'html.parser')
-        table = doc_soup.find('table', class_='tableFile') or doc_soup.find('table', class_='tableFile2')
-        if not table:
+        rows = _index_table_rows(doc_response.content, ('tableFile', 'tableFile2'))
+        if rows is None:
             return None
 
-        rows = table.find_all('tr')[1:]  # Skip header
-
         # Prefer sequence 1 HTML/HTM.
-        for row in rows:
-            cols = row.find_all('td')
+        for cols in rows:
             if len(cols) < 4:
                 continue
-            sequence = cols[0].text.strip()
-            filename = cols[2].text.strip()
+            sequence = _element_text(cols[0]).strip()
+            filename = _element_text(cols[2]).strip()
             if sequence != '1':
                 continue
             if not (filename.endswith('.htm') or filename.endswith('.html') or 'htm' in filename):
                 continue
 
-            link = cols[2].find('a')
-            if not link or not link.get('href'):
+            href = _document_href(cols[2])
+            if not href:
                 continue
-            href = link['href']
             if '/ix?doc=' in href:
                 doc_path = href.split('/ix?doc=')[1]
-                return f"{SEC_BASE_URL}{doc_path}"
-            return f"{SEC_BASE_URL}{href}"
+                url = f"{SEC_BASE_URL}{doc_path}"
+            else:
+                url = f"{SEC_BASE_URL}{href}"
+            self._accession_url_cache[key] = url
+            return url
 
         return None
 
@@ -311,7 +426,6 @@ class SECDownloader:
             raise Exception(f"No {filing_type} filing found for {original_identifier} in {year}")
         
         # Download the filing
-        time.sleep(REQUEST_DELAY)
         response = self.session.get(filing_url, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
         
@@ -322,6 +436,34 @@ class SECDownloader:
         
         return response.text, extension, cik
 
+    def download_filings(
+        self,
+        filings: Iterable[Tuple[str, str, str]],
+        workers: int = 4,
+    ) -> List[Tuple[Optional[Tuple[str, str, str]], Optional[str]]]:
+        """
+        Download several filings concurrently
+
+        Requests from all workers share the downloader's rate limiter, so the
+        SEC request budget holds regardless of the worker count.
+
+        Args:
+            filings: (cik_or_ticker, filing_type, year) tuples
+            workers: Number of download threads
+
+        Returns:
+            List aligned with filings of (download_filing result, None) on
+            success or (None, error message) on failure
+        """
+        def fetch(filing: Tuple[str, str, str]):
+            try:
+                return self.download_filing(*filing), None
+            except Exception as e:
+                return None, str(e)
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            return list(executor.map(fetch, filings))
+
     def download_filing_by_accession(
         self,
         cik_or_ticker: str,
@@ -342,7 +484,6 @@ class SECDownloader:
         if not filing_url:
             raise Exception(f"No filing document found for accession {accession_formatted}")
 
-        time.sleep(REQUEST_DELAY)
         response = self.session.get(filing_url, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
 
@@ -350,3 +491,39 @@ class SECDownloader:
         if filing_url.endswith('.htm'):
             extension = 'htm'
         return response.text, extension, cik
+
+    def download_filing_by_accession_to_file(
+        self,
+        cik_or_ticker: str,
+        accession_formatted: str,
+        dest_path: str,
+    ) -> Tuple[str, str]:
+        """
+        Download a filing by accession number, streaming the body to disk.
+
+        The response bytes are written as received (no decode/re-encode and no
+        full in-memory copy of the document).
+
+        Args:
+            cik_or_ticker: CIK number or ticker symbol
+            accession_formatted: Accession number in dashed format
+            dest_path: File path to write the filing document to
+
+        Returns:
+            Tuple of (file extension, CIK padded to 10 digits)
+        """
+        cik, _original_identifier = self._normalize_cik(cik_or_ticker)
+        filing_url = self._get_document_url_from_accession(cik, accession_formatted)
+        if not filing_url:
+            raise Exception(f"No filing document found for accession {accession_formatted}")
+
+        with self.stream_session.get(filing_url, timeout=REQUEST_TIMEOUT, stream=True) as response:
+            response.raise_for_status()
+            with open(dest_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                    f.write(chunk)
+
+        extension = 'html'
+        if filing_url.endswith('.htm'):
+            extension = 'htm'
+        return extension, cik
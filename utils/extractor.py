@@ -4,10 +4,23 @@ Item Extractor - Extracts individual items from SEC filings
 
 import re
 import unicodedata
-from typing import Dict, List, Any
-from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+from lxml import etree
 from .parser import SECParser
 
+_PAGE_BREAK_RE = re.compile(r"<hr[^>]*page-break-after\s*:\s*always[^>]*>", re.IGNORECASE)
+# Bullet/ornament symbols become spaces; smart quotes and dashes become ASCII
+_PUNCT_REPLACEMENTS = {
+    **dict.fromkeys("\u2022\u25CF\u25A0\u25AA\u25E6\u2043\u2219", " "),
+    "\u2018": "'",
+    "\u2019": "'",
+    "\u201c": '"',
+    "\u201d": '"',
+    "\u2013": "-",
+    "\u2014": "-",
+}
+
 
 class ItemExtractor:
     """Extracts specific items from SEC filings using TOC information"""
@@ -16,6 +29,7 @@ class ItemExtractor:
         """Initialize ItemExtractor"""
         self.parser = SECParser()
         self._page_break_marker = "PAGE_BREAK_MARKER"
+        self._page_break_repl = f"\n{self._page_break_marker}\n"
         
         # Pre-compile artifact patterns for faster detection
         self.artifact_patterns = [
@@ -28,27 +42,33 @@ class ItemExtractor:
             "table of contents", "page", "form", "10-k", "10-q", "10-a",
             "form 10-k summary", "not applicable"
         }
-        self._zero_width_chars = ["\u200b", "\u200c", "\u200d", "\ufeff", "\u2060"]
+        # Lookup forms used by _strip_headers_footers
+        self._artifact_words = self.artifact_phrases | {"|"}
+        self._artifact_bigrams = {
+            tuple(phrase.split()) for phrase in self.artifact_phrases
+            if len(phrase.split()) == 2
+        }
+        self._artifact_re = re.compile(
+            "|".join(f"(?:{pattern.pattern})" for pattern in self.artifact_patterns)
+        )
 
     def _normalize_unicode(self, text: str) -> str:
         """
         Remove invisible unicode artifacts and normalize common smart punctuation.
         """
+        if text.isascii():
+            return text
         text = unicodedata.normalize("NFKC", text)
-        for ch in self._zero_width_chars:
-            text = text.replace(ch, "")
-        # Remove any remaining unicode formatting/control artifacts.
-        text = "".join(ch for ch in text if unicodedata.category(ch) != "Cf")
-        # Remove common bullet/ornament symbols that pollute extracted prose.
-        text = re.sub(r"[\u2022\u25CF\u25A0\u25AA\u25E6\u2043\u2219]", " ", text)
-        return (
-            text.replace("\u2018", "'")
-            .replace("\u2019", "'")
-            .replace("\u201c", '"')
-            .replace("\u201d", '"')
-            .replace("\u2013", "-")
-            .replace("\u2014", "-")
-        )
+        # Classify each distinct character once, then rewrite only the ones
+        # present: zero-width/formatting (Cf) characters are dropped and
+        # bullets, smart quotes and dashes are mapped.
+        for ch in set(text):
+            replacement = _PUNCT_REPLACEMENTS.get(ch)
+            if replacement is None and unicodedata.category(ch) == "Cf":
+                replacement = ""
+            if replacement is not None:
+                text = text.replace(ch, replacement)
+        return text
 
     def _remove_line_artifacts(self, text: str) -> str:
         """
@@ -141,6 +161,9 @@ class ItemExtractor:
             return text
         
         cleaned_pages = []
+        single_words = self._artifact_words
+        bigrams = self._artifact_bigrams
+        artifact_re = self._artifact_re
         
         for page in pages:
             words = page.split()
@@ -148,72 +171,62 @@ class ItemExtractor:
                 cleaned_pages.append(page)
                 continue
             
+            # Trim by moving index bounds instead of pop()/pop(0); only the
+            # boundary word is lowercased on each step.
+            lo, hi = 0, len(words)
+            
             # Remove trailing artifacts (keep at least 10 words)
-            while len(words) > 10:
-                last_word = words[-1].lower()
+            while hi - lo > 10:
+                last_word = words[hi - 1].lower()
                 
                 # Check if last word is an artifact
-                if last_word.isdigit() or last_word in self.artifact_phrases or last_word == '|':
-                    words.pop()
+                if last_word.isdigit() or last_word in single_words:
+                    hi -= 1
                 # Check if last 2 words match artifact phrase
-                elif len(words) >= 2 and ' '.join(words[-2:]).lower() in self.artifact_phrases:
-                    words.pop()
-                    words.pop()
+                elif (words[hi - 2].lower(), last_word) in bigrams:
+                    hi -= 2
                 # Check if last word matches pre-compiled patterns
-                elif any(pattern.match(last_word) for pattern in self.artifact_patterns):
-                    words.pop()
+                elif artifact_re.match(last_word):
+                    hi -= 1
                 else:
                     break
             
             # Remove leading artifacts (keep at least 10 words)
-            while len(words) > 10:
-                first_word = words[0].lower()
+            while hi - lo > 10:
+                first_word = words[lo].lower()
                 
-                if first_word.isdigit() or first_word in self.artifact_phrases or first_word == '|':
-                    words.pop(0)
-                elif len(words) >= 2 and ' '.join(words[:2]).lower() in self.artifact_phrases:
-                    words.pop(0)
-                    words.pop(0)
-                elif any(pattern.match(first_word) for pattern in self.artifact_patterns):
-                    words.pop(0)
+                if first_word.isdigit() or first_word in single_words:
+                    lo += 1
+                elif (first_word, words[lo + 1].lower()) in bigrams:
+                    lo += 2
+                elif artifact_re.match(first_word):
+                    lo += 1
                 else:
                     break
             
-            cleaned_pages.append(' '.join(words) if words else '')
+            cleaned_pages.append(' '.join(words[lo:hi]))
         
         result = ' '.join(p for p in cleaned_pages if p.strip())
         return result.strip()
     
-    def _html_to_text(self, html_content: str) -> str:
+    def _parse_html(self, html_content: str) -> Optional[etree._Element]:
         """
-        Convert HTML to plain text
-        
-        Args:
-            html_content: HTML content
-            
-        Returns:
-            Plain text
+        Parse HTML with lxml and drop script/style elements and comments.
+        Returns None when the markup contains no elements.
         """
-        html_with_breaks = re.sub(
-            r"<hr[^>]*page-break-after\s*:\s*always[^>]*>",
-            f"\n{self._page_break_marker}\n",
-            html_content,
-            flags=re.IGNORECASE,
-        )
+        # feed() accepts str input that carries an XML encoding declaration,
+        # which fromstring() rejects.
+        parser = etree.HTMLParser(remove_comments=True)
+        parser.feed(html_content)
+        root = parser.close()
+        if root is not None:
+            etree.strip_elements(root, 'script', 'style', with_tail=False)
+        return root
+
+    def _tree_text(self, root: Optional[etree._Element]) -> str:
+        """Newline-separated text of a parsed tree"""
+        return '\n'.join(root.itertext()) if root is not None else ''
 
-        soup = BeautifulSoup(html_with_breaks, 'lxml')
-        
-        # Remove script and style elements
-        for script in soup(['script', 'style']):
-            script.decompose()
-        
-        text = soup.get_text(separator='\n')
-        text = self._normalize_unicode(text)
-        text = self._remove_line_artifacts(text)
-        text = ' '.join(text.split())
-        text = self._strip_headers_footers(text)
-        return text
-    
     def _clean_html(self, html_content: str) -> str:
         """
         Clean HTML content while preserving structure
@@ -224,16 +237,14 @@ class ItemExtractor:
         Returns:
             Cleaned HTML content
         """
-        soup = BeautifulSoup(html_content, 'lxml')
-        
-        # Remove script and style tags but keep other formatting
-        for tag in soup(['script', 'style']):
-            tag.decompose()
-        
-        return str(soup)
+        root = self._parse_html(html_content)
+        if root is None:
+            return ''
+        return etree.tostring(root, encoding='unicode', method='html')
     
     def extract_item(self, html_content: str, item_number: str, 
-                    toc_items: Dict[str, Dict[str, str]]) -> Dict[str, Any]:
+                    toc_items: Dict[str, Dict[str, str]],
+                    positions: Optional[Dict[str, Tuple[int, int]]] = None) -> Dict[str, Any]:
         """
         Extract a specific item from the filing
         OPTIMIZED: Parse once, extract both HTML and text from same parse.
@@ -242,6 +253,8 @@ class ItemExtractor:
             html_content: HTML content of the filing
             item_number: Item number to extract (e.g., "1", "1A", "7")
             toc_items: TOC items dictionary from parser
+            positions: Precomputed result of parser.get_item_positions for
+                the same html_content/toc_items; computed here when omitted
             
         Returns:
             Dictionary containing:
@@ -254,7 +267,8 @@ class ItemExtractor:
             raise ValueError(f"Item {item_number} not found in TOC")
         
         # Get positions of all items
-        positions = self.parser.get_item_positions(html_content, toc_items)
+        if positions is None:
+            positions = self.parser.get_item_positions(html_content, toc_items)
         
         if item_number not in positions:
             raise ValueError(f"Could not locate Item {item_number} in the document")
@@ -263,26 +277,35 @@ class ItemExtractor:
         
         # Extract HTML content for this item
         item_html = html_content[start_pos:end_pos]
-        
+        item_title = toc_items[item_number].get('title', f'Item {item_number}')
+        return self._extract_item_slice(item_html, item_number, item_title)
+
+    def _extract_item_slice(self, item_html: str, item_number: str,
+                            item_title: str) -> Dict[str, Any]:
+        """
+        Build the extract_item result for an already sliced item
+
+        Args:
+            item_html: HTML of the item (slice of the filing)
+            item_number: Item number being extracted
+            item_title: Item title from the TOC
+
+        Returns:
+            Dictionary in the extract_item result format
+        """
         # OPTIMIZED: Parse once, extract both HTML and text
-        html_with_breaks = re.sub(
-            r"<hr[^>]*page-break-after\s*:\s*always[^>]*>",
-            f"\n{self._page_break_marker}\n",
-            item_html,
-            flags=re.IGNORECASE,
-        )
+        html_with_breaks = _PAGE_BREAK_RE.sub(self._page_break_repl, item_html)
         
-        soup = BeautifulSoup(html_with_breaks, 'lxml')
-        
-        # Remove script and style tags
-        for tag in soup(['script', 'style']):
-            tag.decompose()
+        root = self._parse_html(html_with_breaks)
         
         # Extract clean HTML
-        item_html_clean = str(soup)
+        item_html_clean = (
+            etree.tostring(root, encoding='unicode', method='html')
+            if root is not None else ''
+        )
         
-        # Extract text from the same parsed soup
-        item_text = soup.get_text(separator='\n')
+        # Extract text from the same parsed tree
+        item_text = self._tree_text(root)
         item_text = self._normalize_unicode(item_text)
         item_text = self._remove_line_artifacts(item_text)
         item_text = ' '.join(item_text.split())  # Collapse whitespace
@@ -291,29 +314,46 @@ class ItemExtractor:
         
         return {
             'item_number': item_number,
-            'item_title': toc_items[item_number].get('title', f'Item {item_number}'),
+            'item_title': item_title,
             'html_content': item_html_clean,
             'text_content': item_text
         }
     
-    def extract_items(self, html_content: str, item_numbers: List[str], 
-                     toc_items: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, Any]]:
+    def extract_items(self, html_content: str, item_numbers: Iterable[str], 
+                     toc_items: Dict[str, Dict[str, str]],
+                     workers: int = 1) -> Dict[str, Dict[str, Any]]:
         """
         Extract multiple items from the filing
         
         Args:
             html_content: HTML content of the filing
-            item_numbers: List of item numbers to extract
+            item_numbers: Item numbers to extract (any iterable)
             toc_items: TOC items dictionary from parser
+            workers: Worker processes for per-item parsing; with more than
+                one, item slices are extracted in parallel
             
         Returns:
             Dictionary mapping item numbers to extracted item data
         """
+        item_numbers = list(item_numbers)
+
+        # Locate all items once per filing instead of once per item; on
+        # failure each extract_item call retries and reports its own error.
+        try:
+            positions = self.parser.get_item_positions(html_content, toc_items)
+        except Exception:
+            positions = None
+
+        if workers > 1 and len(item_numbers) > 2 and positions is not None:
+            return self._extract_items_parallel(
+                html_content, item_numbers, toc_items, positions, workers
+            )
+
         extracted_items = {}
         
         for item_number in item_numbers:
             try:
-                item_data = self.extract_item(html_content, item_number, toc_items)
+                item_data = self.extract_item(html_content, item_number, toc_items, positions)
                 extracted_items[item_number] = item_data
             except Exception as e:
                 # Log the error but continue with other items
@@ -323,6 +363,43 @@ class ItemExtractor:
         
         return extracted_items
     
+    def _extract_items_parallel(self, html_content: str, item_numbers: List[str],
+                                toc_items: Dict[str, Dict[str, str]],
+                                positions: Dict[str, Tuple[int, int]],
+                                workers: int) -> Dict[str, Dict[str, Any]]:
+        """
+        extract_items over a process pool: each worker only receives its
+        item's HTML slice.
+        """
+        extracted_items: Dict[str, Dict[str, Any]] = {}
+        jobs: Dict[str, Tuple[str, str]] = {}
+
+        for item_number in item_numbers:
+            if item_number not in toc_items:
+                extracted_items[item_number] = {'error': f"Item {item_number} not found in TOC"}
+            elif item_number not in positions:
+                extracted_items[item_number] = {
+                    'error': f"Could not locate Item {item_number} in the document"
+                }
+            else:
+                start_pos, end_pos = positions[item_number]
+                item_title = toc_items[item_number].get('title', f'Item {item_number}')
+                jobs[item_number] = (html_content[start_pos:end_pos], item_title)
+                extracted_items[item_number] = {}  # keeps item_numbers order
+
+        with ProcessPoolExecutor(max_workers=min(workers, max(1, len(jobs)))) as executor:
+            futures = {
+                item_number: executor.submit(_extract_item_slice_worker, item_html, item_number, item_title)
+                for item_number, (item_html, item_title) in jobs.items()
+            }
+            for item_number, future in futures.items():
+                try:
+                    extracted_items[item_number] = future.result()
+                except Exception as e:
+                    extracted_items[item_number] = {'error': str(e)}
+
+        return extracted_items
+
     def extract_all_items(self, html_content: str, 
                          toc_items: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, Any]]:
         """
@@ -335,6 +412,15 @@ class ItemExtractor:
         Returns:
             Dictionary mapping item numbers to extracted item data
         """
-        item_numbers = list(toc_items.keys())
-        return self.extract_items(html_content, item_numbers, toc_items)
+        return self.extract_items(html_content, toc_items.keys(), toc_items)
+
+
+_WORKER_EXTRACTOR: Optional[ItemExtractor] = None
+
 
+def _extract_item_slice_worker(item_html: str, item_number: str, item_title: str) -> Dict[str, Any]:
+    """Process-pool entry point for ItemExtractor._extract_items_parallel"""
+    global _WORKER_EXTRACTOR
+    if _WORKER_EXTRACTOR is None:
+        _WORKER_EXTRACTOR = ItemExtractor()
+    return _WORKER_EXTRACTOR._extract_item_slice(item_html, item_number, item_title)
@@ -4,7 +4,77 @@ File Manager for handling file operations and directory structure
 
 import json
 import os
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Sequence, Set
+
+try:
+    import orjson  # type: ignore
+    _HAS_ORJSON = True
+except Exception:
+    _HAS_ORJSON = False
+
+try:
+    import zstandard  # type: ignore
+    _HAS_ZSTD = True
+except Exception:
+    _HAS_ZSTD = False
+
+ZSTD_SUFFIX = ".zst"
+ZSTD_LEVEL = 6
+
+
+def read_html_file(file_path: str, errors: str = "strict") -> str:
+    """
+    Read a saved filing, transparently decompressing `.zst` files
+
+    Args:
+        file_path: Path to an .htm/.html file or its .zst-compressed form
+        errors: Unicode decode error handling
+
+    Returns:
+        Decoded HTML content
+    """
+    if file_path.endswith(ZSTD_SUFFIX):
+        if not _HAS_ZSTD:
+            raise RuntimeError(f"zstandard is required to read {file_path}")
+        with open(file_path, "rb") as f:
+            data = zstandard.ZstdDecompressor().stream_reader(f).read()
+        return data.decode("utf-8", errors=errors)
+    with open(file_path, "r", encoding="utf-8", errors=errors) as f:
+        return f.read()
+
+
+def loads_json(data: bytes) -> Any:
+    """
+    Parse a UTF-8 JSON document (orjson when available)
+
+    Args:
+        data: Encoded JSON document
+
+    Returns:
+        Decoded data
+    """
+    if _HAS_ORJSON:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Stdlib accepts a few non-standard inputs (NaN, BOM) orjson rejects.
+            pass
+    return json.loads(data)
+
+
+def dumps_json(data: Any) -> bytes:
+    """
+    Serialize data as indented UTF-8 JSON bytes (orjson when available)
+
+    Args:
+        data: JSON-serializable data
+
+    Returns:
+        Encoded JSON document
+    """
+    if _HAS_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
 
 
 class FileManager:
@@ -18,6 +88,13 @@ class FileManager:
             base_dir: Base directory for storing SEC filings
         """
         self.base_dir = base_dir
+        # Directories already created by this instance (skips repeat mkdir calls)
+        self._known_dirs: Set[str] = set()
+
+    def _ensure_dir(self, dir_path: str) -> None:
+        if dir_path and dir_path not in self._known_dirs:
+            os.makedirs(dir_path, exist_ok=True)
+            self._known_dirs.add(dir_path)
 
     def get_filing_path(self, cik_ticker: str, year: str, filing_type: str, extension: str = "html") -> str:
         """
@@ -65,8 +142,8 @@ class FileManager:
         filing_dir = os.path.join(self.base_dir, cik_ticker, year, filing_type)
         items_dir = os.path.join(filing_dir, "items")
 
-        os.makedirs(filing_dir, exist_ok=True)
-        os.makedirs(items_dir, exist_ok=True)
+        self._ensure_dir(filing_dir)
+        self._ensure_dir(items_dir)
 
     def file_exists(self, file_path: str) -> bool:
         """
@@ -76,34 +153,119 @@ class FileManager:
             file_path: Path to the file
 
         Returns:
-            True if file exists, False otherwise
+            True if the file (or its .zst-compressed form) exists
+        """
+        return os.path.isfile(file_path) or os.path.isfile(file_path + ZSTD_SUFFIX)
+
+    def find_existing_filing(
+        self,
+        cik_ticker: str,
+        year: str,
+        filing_type: str,
+        extensions: Sequence[str] = ("htm", "html"),
+    ) -> Optional[str]:
         """
-        return os.path.isfile(file_path)
+        Find a stored filing in any of its extensions with a single directory scan
+
+        Args:
+            cik_ticker: CIK number or ticker symbol
+            year: Filing year
+            filing_type: Type of filing (10-K or 10-Q)
+            extensions: Candidate extensions in order of preference
 
-    def save_html(self, file_path: str, content: str) -> None:
+        Returns:
+            Path of the first matching file (plain or `.zst`), or None
+        """
+        filing_dir = os.path.join(self.base_dir, cik_ticker, year, filing_type)
+        try:
+            with os.scandir(filing_dir) as it:
+                names = {entry.name for entry in it if entry.is_file()}
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        base_name = f"{cik_ticker}_{year}_{filing_type}"
+        for ext in extensions:
+            for name in (f"{base_name}.{ext}", f"{base_name}.{ext}{ZSTD_SUFFIX}"):
+                if name in names:
+                    return os.path.join(filing_dir, name)
+        return None
+
+    def save_html(self, file_path: str, content: str, compress: bool = False) -> str:
         """
         Save HTML content to a file
 
         Args:
             file_path: Path to save the file
             content: HTML content to save
+            compress: Write zstd-compressed content to `file_path + ".zst"`
+
+        Returns:
+            Path of the written file
+        """
+        self._ensure_dir(os.path.dirname(file_path))
+        plain_path = file_path
+        if compress:
+            if not _HAS_ZSTD:
+                raise RuntimeError("zstandard is required for compressed HTML output")
+            file_path = plain_path + ZSTD_SUFFIX
+            with open(file_path, "wb") as f:
+                with zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(f) as writer:
+                    writer.write(content.encode("utf-8"))
+        else:
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(content)
+        self._remove_other_form(plain_path, compress)
+        return file_path
+
+    def store_html_file(self, src_path: str, file_path: str, compress: bool = False) -> str:
+        """
+        Move an already-downloaded filing into place
+
+        The source file is renamed (or zstd-compressed into place and
+        removed), so the document never has to be loaded into memory.
+
+        Args:
+            src_path: Path of the downloaded file
+            file_path: Destination path for the filing
+            compress: Store zstd-compressed at `file_path + ".zst"`
+
+        Returns:
+            Path of the stored file
         """
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(content)
+        self._ensure_dir(os.path.dirname(file_path))
+        plain_path = file_path
+        if compress:
+            if not _HAS_ZSTD:
+                raise RuntimeError("zstandard is required for compressed HTML output")
+            file_path = plain_path + ZSTD_SUFFIX
+            with open(src_path, "rb") as src, open(file_path, "wb") as dst:
+                zstandard.ZstdCompressor(level=ZSTD_LEVEL).copy_stream(src, dst)
+            os.remove(src_path)
+        else:
+            os.replace(src_path, file_path)
+        self._remove_other_form(plain_path, compress)
+        return file_path
+
+    def _remove_other_form(self, plain_path: str, compressed: bool) -> None:
+        # Keep a single stored form so readers never pick up an outdated copy.
+        stale_path = plain_path if compressed else plain_path + ZSTD_SUFFIX
+        if os.path.isfile(stale_path):
+            os.remove(stale_path)
 
     def load_html(self, file_path: str) -> str:
         """
         Load HTML content from a file
 
+        Falls back to the `.zst` sibling when only the compressed file exists.
+
         Args:
             file_path: Path to the file
 
         Returns:
             HTML content
         """
-        with open(file_path, "r", encoding="utf-8") as f:
-            return f.read()
+        if not os.path.isfile(file_path) and os.path.isfile(file_path + ZSTD_SUFFIX):
+            file_path = file_path + ZSTD_SUFFIX
+        return read_html_file(file_path)
 
     def save_item_json(self, file_path: str, item_data: Dict[str, Any]) -> None:
         """
@@ -113,9 +275,9 @@ class FileManager:
             file_path: Path to save the JSON file
             item_data: Dictionary containing item data
         """
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(item_data, f, indent=2, ensure_ascii=False)
+        self._ensure_dir(os.path.dirname(file_path))
+        with open(file_path, "wb") as f:
+            f.write(dumps_json(item_data))
 
     def load_item_json(self, file_path: str) -> Dict[str, Any]:
         """
@@ -127,8 +289,8 @@ class FileManager:
         Returns:
             Dictionary containing item data
         """
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(file_path, "rb") as f:
+            return loads_json(f.read())
 
     def load_json(self, file_path: str) -> Dict[str, Any]:
         """
@@ -140,8 +302,8 @@ class FileManager:
         Returns:
             Dictionary containing JSON data
         """
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(file_path, "rb") as f:
+            return loads_json(f.read())
 
     def save_json(self, file_path: str, data: Dict[str, Any]) -> None:
         """
@@ -151,6 +313,6 @@ class FileManager:
             file_path: Path to save the JSON file
             data: Dictionary containing data to save
         """
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        self._ensure_dir(os.path.dirname(file_path))
+        with open(file_path, "wb") as f:
+            f.write(dumps_json(data))
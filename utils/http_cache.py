@@ -0,0 +1,99 @@
+"""
+HTTP session factory with optional response caching for SEC requests
+"""
+
+import os
+from datetime import timedelta
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.config import CACHE_DIR, HTTP_POOL_MAXSIZE, HTTP_MAX_RETRIES
+from utils.rate_limiter import SEC_RATE_LIMITER, TokenBucket
+
+try:
+    import requests_cache  # type: ignore
+    _HAS_REQUESTS_CACHE = True
+except Exception:
+    _HAS_REQUESTS_CACHE = False
+
+
+class _RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that takes a rate-limiter token before each network send"""
+
+    def __init__(self, rate_limiter: Optional[TokenBucket], **kwargs):
+        self.rate_limiter = rate_limiter
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        # Cache hits are answered by the session and never reach the adapter,
+        # so only real SEC requests spend tokens.
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        return super().send(request, **kwargs)
+
+
+def create_sec_session(
+    user_agent: str,
+    use_cache: bool = True,
+    rate_limiter: Optional[TokenBucket] = SEC_RATE_LIMITER,
+) -> requests.Session:
+    """
+    Create an HTTP session for SEC requests
+
+    When requests-cache is installed, GET responses are stored in a SQLite
+    cache under CACHE_DIR. Archived filing documents never change once
+    published and are kept indefinitely; full-index files and submissions
+    JSON are refreshed daily; search pages (browse-edgar) and the ticker list
+    (persisted separately by TickerCache) are never cached.
+
+    Connections are pooled per host (sized for concurrent download workers)
+    and GETs are retried with exponential backoff on connection errors and
+    transient 5xx responses. Requests that go out to the network draw from
+    `rate_limiter`; responses served from the cache do not.
+
+    Args:
+        user_agent: User agent string for SEC requests
+        use_cache: Set False to force a plain uncached session
+        rate_limiter: Token bucket paced per network request (None disables)
+
+    Returns:
+        Configured requests session
+    """
+    if use_cache and _HAS_REQUESTS_CACHE:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        session = requests_cache.CachedSession(
+            cache_name=os.path.join(CACHE_DIR, "http"),
+            backend="sqlite",
+            expire_after=timedelta(days=90),
+            allowable_methods=("GET",),
+            match_headers=["User-Agent"],
+            urls_expire_after={
+                "*/cgi-bin/browse-edgar*": requests_cache.DO_NOT_CACHE,
+                "*/files/company_tickers.json": requests_cache.DO_NOT_CACHE,
+                "*/Archives/edgar/full-index/*": timedelta(days=1),
+                "*/submissions/*": timedelta(days=1),
+                "*/Archives/edgar/data/*": requests_cache.NEVER_EXPIRE,
+            },
+        )
+    else:
+        session = requests.Session()
+    retry = Retry(
+        total=HTTP_MAX_RETRIES,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(["GET"]),
+        raise_on_status=False,
+    )
+    adapter = _RateLimitedAdapter(
+        rate_limiter,
+        pool_connections=4,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({'User-Agent': user_agent})
+    return session
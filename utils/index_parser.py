@@ -2,27 +2,89 @@
 SEC EDGAR Full-Index Parser - Retrieves all companies from quarterly index files
 """
 
+import gzip
+import os
 import requests
 import re
-from typing import List, Set, Dict, Tuple
-from utils.config import SEC_BASE_URL, SEC_USER_AGENT, REQUEST_TIMEOUT, REQUEST_DELAY
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import List, Set, Dict, Iterator, Optional, Tuple
+from utils.config import SEC_BASE_URL, SEC_USER_AGENT, REQUEST_TIMEOUT, CACHE_DIR
+from utils.http_cache import create_sec_session
+from utils.rate_limiter import SEC_RATE_LIMITER
+
+# Cached index of the still-open quarter is refreshed after this many seconds.
+INDEX_CACHE_TTL = 24 * 3600
+# Late index corrections can land shortly after quarter end.
+INDEX_CLOSE_GRACE_DAYS = 7
+
+# Concurrent quarterly index downloads (requests are still paced by the
+# shared SEC rate limiter).
+INDEX_DOWNLOAD_WORKERS = 4
+
+ACCESSION_PATTERN = re.compile(r'(\d{10}-\d{2}-\d{6})')
 
 
 class SECIndexParser:
     """Parses SEC EDGAR full-index files to get all companies for a filing type"""
     
-    def __init__(self, user_agent: str = SEC_USER_AGENT):
+    def __init__(self, user_agent: str = SEC_USER_AGENT, cache_dir: Optional[str] = None):
         """
         Initialize SECIndexParser
         
         Args:
             user_agent: User agent string for SEC requests
+            cache_dir: Directory for cached index files (default: CACHE_DIR/index)
         """
         self.user_agent = user_agent
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': user_agent})
+        self.rate_limiter = SEC_RATE_LIMITER
+        self.session = create_sec_session(user_agent, rate_limiter=self.rate_limiter)
+        self.cache_dir = cache_dir or os.path.join(CACHE_DIR, "index")
     
+    def _index_cache_path(self, year: int, quarter: int) -> str:
+        return os.path.join(self.cache_dir, f"company_{year}_Q{quarter}.idx.gz")
+
+    def _is_index_cache_valid(self, path: str, year: int, quarter: int) -> bool:
+        """
+        Closed quarters never change once published, so their cached index is
+        kept indefinitely; the open quarter is refreshed after INDEX_CACHE_TTL.
+        """
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return False
+        # First day after the quarter (e.g. 2023 Q4 -> 2024-01-01).
+        next_quarter_start = (date(year, quarter * 3, 1) + timedelta(days=31)).replace(day=1)
+        written = datetime.fromtimestamp(mtime).date()
+        if written >= next_quarter_start + timedelta(days=INDEX_CLOSE_GRACE_DAYS):
+            return True
+        return (time.time() - mtime) < INDEX_CACHE_TTL
+
+    def _read_cached_index(self, year: int, quarter: int) -> Optional[str]:
+        path = self._index_cache_path(year, quarter)
+        if not self._is_index_cache_valid(path, year, quarter):
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return f.read()
+        except (OSError, EOFError, UnicodeDecodeError):
+            return None
+
+    def _write_cached_index(self, year: int, quarter: int, content: str) -> None:
+        path = self._index_cache_path(year, quarter)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Unique per process/thread so concurrent writers never share a file
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Caching is best-effort; the downloaded content is still used.
+            pass
+
     def _download_index_file(self, year: int, quarter: int) -> str:
         """
         Download company.idx file for a specific year and quarter
@@ -37,13 +99,19 @@ class SECIndexParser:
         Raises:
             Exception if download fails
         """
+        cached = self._read_cached_index(year, quarter)
+        if cached is not None:
+            return cached
+
         url = f"{SEC_BASE_URL}/Archives/edgar/full-index/{year}/QTR{quarter}/company.idx"
         
         try:
-            time.sleep(REQUEST_DELAY)  # Rate limiting
             response = self.session.get(url, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
-            return response.text
+            content = response.text
+            if content:
+                self._write_cached_index(year, quarter, content)
+            return content
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
                 # Quarter might not be available yet
@@ -52,6 +120,25 @@ class SECIndexParser:
         except Exception as e:
             raise Exception(f"Failed to download index for {year} Q{quarter}: {str(e)}")
     
+    def _iter_index_files(self, years: List[int]) -> Iterator[Tuple[int, int, Optional[str], Optional[Exception]]]:
+        """
+        Download the quarterly index files for the given years concurrently
+        
+        Args:
+            years: Years to download (Q1-Q4 each)
+            
+        Returns:
+            Iterator of (year, quarter, content, error) in year/quarter order
+        """
+        quarters = [(year, quarter) for year in years for quarter in range(1, 5)]
+        with ThreadPoolExecutor(max_workers=INDEX_DOWNLOAD_WORKERS) as executor:
+            futures = [executor.submit(self._download_index_file, y, q) for y, q in quarters]
+            for (year, quarter), future in zip(quarters, futures):
+                try:
+                    yield year, quarter, future.result(), None
+                except Exception as e:
+                    yield year, quarter, None, e
+
     def _parse_index_file(self, content: str, filing_type: str) -> List[Dict[str, str]]:
         """
         Parse company.idx file and extract filings of specific type
@@ -65,17 +152,18 @@ class SECIndexParser:
         """
         filings = []
         
-        # Skip header lines (usually first 10 lines are headers)
-        lines = content.split('\n')
-        data_started = False
+        # Header ends with a line of dashes
+        header_end = content.find('---')
+        if header_end < 0:
+            return filings
+        body_start = content.find('\n', header_end)
+        if body_start < 0:
+            return filings
         
-        for line in lines:
-            # Header ends with a line of dashes
-            if '---' in line:
-                data_started = True
-                continue
-            
-            if not data_started or not line.strip():
+        for line in content[body_start + 1:].split('\n'):
+            # Any matching row contains the form type verbatim, so this cheap
+            # substring test discards most rows before they are split.
+            if filing_type not in line or '---' in line or not line.strip():
                 continue
             
             # Parse line: Company Name | Form Type | CIK | Date Filed | File Name
@@ -132,7 +220,7 @@ class SECIndexParser:
         """
         if not file_name:
             return ""
-        match = re.search(r'(\d{10}-\d{2}-\d{6})', file_name)
+        match = ACCESSION_PATTERN.search(file_name)
         if match:
             return match.group(1)
         return ""
@@ -152,17 +240,17 @@ class SECIndexParser:
             List of filing records with cik/date_filed/file_name/accession_number.
         """
         all_records: List[Dict[str, str]] = []
-        for year in years:
-            for quarter in range(1, 5):
-                try:
-                    content = self._download_index_file(year, quarter)
-                    if not content:
-                        continue
-                    records = self._parse_index_file(content, filing_type)
-                    all_records.extend(records)
-                except Exception as e:
-                    print(f"Warning: Failed to process {year} Q{quarter}: {str(e)}")
+        for year, quarter, content, error in self._iter_index_files(years):
+            try:
+                if error is not None:
+                    raise error
+                if not content:
                     continue
+                records = self._parse_index_file(content, filing_type)
+                all_records.extend(records)
+            except Exception as e:
+                print(f"Warning: Failed to process {year} Q{quarter}: {str(e)}")
+                continue
         all_records.sort(key=lambda x: x.get('date_filed', ''), reverse=True)
         return all_records
     
@@ -180,35 +268,36 @@ class SECIndexParser:
         all_filings = []
         seen_combinations = set()  # Track (CIK, year) to avoid duplicates
         
-        for year in years:
-            for quarter in range(1, 5):  # Q1-Q4
-                try:
-                    # Download index file
-                    content = self._download_index_file(year, quarter)
-                    
-                    if not content:
-                        # Quarter not available (e.g., future quarter)
-                        continue
-                    
-                    # Parse and filter
-                    filings = self._parse_index_file(content, filing_type)
+        # Index files download concurrently; results are consumed in
+        # year/quarter order so deduplication keeps the same first filing.
+        for year, quarter, content, error in self._iter_index_files(years):
+            try:
+                if error is not None:
+                    raise error
+                
+                if not content:
+                    # Quarter not available (e.g., future quarter)
+                    continue
+                
+                # Parse and filter
+                filings = self._parse_index_file(content, filing_type)
+                
+                # Add to results, avoiding duplicates
+                for filing in filings:
+                    # Extract year from date_filed (format: YYYY-MM-DD)
+                    filed_year = filing['date_filed'][:4] if filing['date_filed'] else str(year)
                     
-                    # Add to results, avoiding duplicates
-                    for filing in filings:
-                        # Extract year from date_filed (format: YYYY-MM-DD)
-                        filed_year = filing['date_filed'][:4] if filing['date_filed'] else str(year)
-                        
-                        # Create unique key
-                        key = (filing['cik'], filed_year)
-                        
-                        if key not in seen_combinations:
-                            seen_combinations.add(key)
-                            all_filings.append(filing)
+                    # Create unique key
+                    key = (filing['cik'], filed_year)
                     
-                except Exception as e:
-                    # Log error but continue with other quarters
-                    print(f"Warning: Failed to process {year} Q{quarter}: {str(e)}")
-                    continue
+                    if key not in seen_combinations:
+                        seen_combinations.add(key)
+                        all_filings.append(filing)
+                
+            except Exception as e:
+                # Log error but continue with other quarters
+                print(f"Warning: Failed to process {year} Q{quarter}: {str(e)}")
+                continue
         
         # Sort by date filed
         all_filings.sort(key=lambda x: x['date_filed'], reverse=True)
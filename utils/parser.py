@@ -4,9 +4,58 @@ SEC Filing Parser - Detects and parses Table of Contents
 
 import re
 import unicodedata
-from typing import Dict, Optional, Tuple
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
 from bs4 import BeautifulSoup, Tag
 
+try:
+    import lxml  # noqa: F401  # type: ignore
+    _HAS_LXML = True
+except Exception:
+    _HAS_LXML = False
+
+# lxml builds the tree in C; html.parser is the pure-Python fallback.
+_SOUP_PARSER = "lxml" if _HAS_LXML else "html.parser"
+
+# Every id/name attribute value, for the one-pass anchor index in
+# get_item_positions. Same shape as _anchor_attr_pattern.
+_ANCHOR_ATTR_RE = re.compile(r'(?:id|name)\s*=\s*[\'"]([^\'"]*)[\'"]', re.IGNORECASE)
+
+# Text cleanup
+_SINGLE_QUOTES_RE = re.compile(r"[\u2018\u2019\u201A\u201B\u2032\u02BC\u00B4]")
+_DOUBLE_QUOTES_RE = re.compile(r"[\u201C\u201D\u201E\u2033]")
+_WS_RE = re.compile(r'\s+')
+_TRAILING_PAGE_RE = re.compile(r'\s+\d+\s*$')
+_DOT_PAGE_RE = re.compile(r'\.\s*\d+\s*$')
+_TRAILING_DIGITS_RE = re.compile(r'\d+\s*$')
+
+# Item-number detection, in priority order
+_ITEM_NUMBER_RES = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'item\s+(\d{1,2}[A-Za-z]?)\b',  # "Item 1A", "Item 7"
+        r'part\s+[IV]+\s*[–-]\s*item\s+(\d{1,2}[A-Za-z]?)\b',  # "Part II - Item 1A"
+        r'^\s*(\d{1,2}[A-Za-z]?)(?=[A-Za-z])',  # "1Business", "1ARisk Factors"
+        r'^\s*(\d{1,2}[A-Za-z]?)\s*[.:-]\s*[A-Za-z]',  # "1A. Risk Factors", "1: Business"
+        r'^\s*(\d{1,2}[A-Za-z]?)\s+[A-Za-z]',  # "1A Risk Factors" (TOC row variant)
+    )
+)
+_COMBINED_ITEMS_RE = re.compile(
+    r'\bitems?\s+(\d{1,2}[a-z]?)\s*(?:[.:])?\s+and\s+(\d{1,2}[a-z]?)\b',
+    re.IGNORECASE,
+)
+_ROW_ITEM_NUMBER_RES = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'item\s+(\d{1,2}[a-z]?)\b',
+        r'part\s+[ivx]+\s*[.:-]?\s*(\d{1,2}[a-z]?)\s*[.:]',
+        r'(?<!\d)(\d{1,2}[a-z]?)\s*[.:]\s*[a-z]',
+    )
+)
+_TABLE_ITEM_RE = re.compile(r'item\s+\d+[a-z]?')
+_DIGIT_RE = re.compile(r'\d')
+_TOC_TABLE_WORDS = ('item', 'part', 'contents', 'index')
+
 
 class SECParser:
     """Parses SEC filings to extract Table of Contents"""
@@ -40,6 +89,51 @@ class SECParser:
         self.toc_region_length = 260000
         # Fallback window when no explicit TOC marker exists.
         self.toc_fallback_prefix_length = 800000
+        # Per-item/per-anchor patterns, compiled once and reused across filings.
+        self._item_heading_patterns: Dict[str, re.Pattern] = {}
+        self._anchor_attr_patterns: Dict[str, re.Pattern] = {}
+
+    def _item_heading_pattern(self, item_num: str) -> re.Pattern:
+        """
+        Compiled ITEM-heading pattern for an item number (cached)
+        
+        Args:
+            item_num: Item number (e.g., "1A")
+            
+        Returns:
+            Pattern matching "ITEM <item_num>" with tags/spaces in between
+        """
+        pattern = self._item_heading_patterns.get(item_num)
+        if pattern is None:
+            # Allow tags/non-breaking spaces between ITEM and item number.
+            pattern = re.compile(
+                rf'ITEM(?:\s|&nbsp;|&#160;|<[^>]+>){{0,20}}{re.escape(item_num)}(?:\b|[.:])',
+                re.IGNORECASE,
+            )
+            self._item_heading_patterns[item_num] = pattern
+        return pattern
+
+    def _anchor_attr_pattern(self, anchor: str) -> re.Pattern:
+        """
+        Compiled id/name attribute pattern for an anchor (cached)
+        
+        Args:
+            anchor: Anchor id or name
+            
+        Returns:
+            Pattern matching id="anchor" or name="anchor"
+        """
+        pattern = self._anchor_attr_patterns.get(anchor)
+        if pattern is None:
+            # Anchors are filing-specific; keep the cache bounded.
+            if len(self._anchor_attr_patterns) >= 4096:
+                self._anchor_attr_patterns.clear()
+            pattern = re.compile(
+                rf'(?:id|name)\s*=\s*[\'\"]{re.escape(anchor)}[\'\"]',
+                re.IGNORECASE,
+            )
+            self._anchor_attr_patterns[anchor] = pattern
+        return pattern
 
     def _clean_text(self, text: str) -> str:
         """
@@ -54,10 +148,10 @@ class SECParser:
         # Normalize and remove invisible formatting chars (generic cleanup)
         text = unicodedata.normalize("NFKC", text)
         text = "".join(ch for ch in text if unicodedata.category(ch) != "Cf")
-        text = re.sub(r"[\u2018\u2019\u201A\u201B\u2032\u02BC\u00B4]", "'", text)
-        text = re.sub(r"[\u201C\u201D\u201E\u2033]", '"', text)
+        text = _SINGLE_QUOTES_RE.sub("'", text)
+        text = _DOUBLE_QUOTES_RE.sub('"', text)
         # Replace multiple whitespaces with single space
-        text = re.sub(r'\s+', ' ', text)
+        text = _WS_RE.sub(' ', text)
         return text.strip()
     
     def _clean_item_title(self, text: str) -> str:
@@ -72,9 +166,9 @@ class SECParser:
         """
         # Remove trailing page numbers (common patterns)
         # Pattern: digit(s) at the end, possibly after dots or spaces
-        text = re.sub(r'\s+\d+\s*$', '', text)  # "Item 1. Business 1" -> "Item 1. Business"
-        text = re.sub(r'\.\s*\d+\s*$', '.', text)  # "Business.1" -> "Business."
-        text = re.sub(r'\d+\s*$', '', text)  # Remove trailing digits
+        text = _TRAILING_PAGE_RE.sub('', text)  # "Item 1. Business 1" -> "Item 1. Business"
+        text = _DOT_PAGE_RE.sub('.', text)  # "Business.1" -> "Business."
+        text = _TRAILING_DIGITS_RE.sub('', text)  # Remove trailing digits
         return text.strip()
     
     def _extract_item_number(self, text: str) -> Optional[str]:
@@ -86,17 +180,13 @@ class SECParser:
             
         Returns:
             Item number (e.g., "1", "1A", "7") or None
-        """        # Common patterns for items
-        patterns = [
-            r'item\s+(\d{1,2}[A-Za-z]?)\b',  # "Item 1A", "Item 7"
-            r'part\s+[IV]+\s*[–-]\s*item\s+(\d{1,2}[A-Za-z]?)\b',  # "Part II - Item 1A"
-            r'^\s*(\d{1,2}[A-Za-z]?)(?=[A-Za-z])',  # "1Business", "1ARisk Factors"
-            r'^\s*(\d{1,2}[A-Za-z]?)\s*[.:-]\s*[A-Za-z]',  # "1A. Risk Factors", "1: Business"
-            r'^\s*(\d{1,2}[A-Za-z]?)\s+[A-Za-z]',  # "1A Risk Factors" (TOC row variant)
-        ]
+        """
+        # Every item pattern needs a digit
+        if not _DIGIT_RE.search(text):
+            return None
         text_lower = text.lower()
-        for pattern in patterns:
-            match = re.search(pattern, text_lower, re.IGNORECASE)
+        for pattern in _ITEM_NUMBER_RES:
+            match = pattern.search(text_lower)
             if match:
                 return match.group(1).upper()
         
@@ -117,11 +207,7 @@ class SECParser:
 
         # Handle explicit combined plural rows first (non-standard but seen in filings),
         # e.g. "Items 1 and 2. Business and Properties".
-        combo = re.search(
-            r'\bitems?\s+(\d{1,2}[a-z]?)\s*(?:[.:])?\s+and\s+(\d{1,2}[a-z]?)\b',
-            text_lower,
-            re.IGNORECASE,
-        )
+        combo = _COMBINED_ITEMS_RE.search(text_lower)
         if combo:
             for g in (combo.group(1), combo.group(2)):
                 token = g.upper()
@@ -129,13 +215,8 @@ class SECParser:
                     seen.add(token)
                     found.append(token)
 
-        patterns = [
-            r'item\s+(\d{1,2}[a-z]?)\b',
-            r'part\s+[ivx]+\s*[.:-]?\s*(\d{1,2}[a-z]?)\s*[.:]',
-            r'(?<!\d)(\d{1,2}[a-z]?)\s*[.:]\s*[a-z]',
-        ]
-        for pat in patterns:
-            for m in re.finditer(pat, text_lower, re.IGNORECASE):
+        for pat in _ROW_ITEM_NUMBER_RES:
+            for m in pat.finditer(text_lower):
                 token = m.group(1).upper()
                 if token not in seen:
                     seen.add(token)
@@ -159,7 +240,15 @@ class SECParser:
         potential_toc_tables = []
         
         for table in tables:
-            table_text = self._clean_text(table.get_text())
+            raw_text = table.get_text()
+            # Every TOC indicator and item pattern needs one of these words;
+            # ASCII text is unchanged by _clean_text apart from whitespace,
+            # so such tables can be rejected before the full cleanup.
+            if raw_text.isascii():
+                raw_lower = raw_text.lower()
+                if not any(word in raw_lower for word in _TOC_TABLE_WORDS):
+                    continue
+            table_text = self._clean_text(raw_text)
             table_text_lower = table_text.lower()
             
             # Check if table contains TOC indicators
@@ -174,7 +263,7 @@ class SECParser:
             ]
             
             # Count how many item references are in the table
-            item_count = len(re.findall(r'item\s+\d+[a-z]?', table_text_lower))
+            item_count = len(_TABLE_ITEM_RE.findall(table_text_lower))
             
             # If table has TOC indicators or many items, it's likely the TOC
             has_toc_indicator = any(indicator in table_text_lower for indicator in toc_indicators)
@@ -289,7 +378,11 @@ class SECParser:
             if len(toc_items) >= max_items_to_find:
                 break
                 
-            text = self._clean_text(heading.get_text())
+            raw_text = heading.get_text()
+            # ASCII text without a digit stays digit-free after cleanup
+            if raw_text.isascii() and not _DIGIT_RE.search(raw_text):
+                continue
+            text = self._clean_text(raw_text)
             item_number = self._extract_item_number(text)
             
             if item_number:
@@ -418,7 +511,7 @@ class SECParser:
             # In that case, only attempt table-based detection in the beginning region.
             toc_region_html = html_content[:self.toc_fallback_prefix_length]
 
-        soup = BeautifulSoup(toc_region_html, 'html.parser')
+        soup = BeautifulSoup(toc_region_html, _SOUP_PARSER)
         
         def _merge_missing(base: Dict[str, Dict[str, str]], extra: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, str]]:
             for k, v in extra.items():
@@ -450,8 +543,10 @@ class SECParser:
                 if anchored_count >= 2:
                     # Enrich once with a broader prefix scan to recover edge rows
                     # not present in the immediate TOC marker region.
-                    broad_soup = BeautifulSoup(html_content[: self.toc_fallback_prefix_length], "html.parser")
+                    broad_soup = BeautifulSoup(html_content[: self.toc_fallback_prefix_length], _SOUP_PARSER)
                     broad_items = self._parse_toc_from_links(broad_soup)
+                    broad_soup.decompose()
+                    soup.decompose()
                     toc_items = _merge_missing(toc_items, broad_items)
                     return toc_items
 
@@ -459,32 +554,47 @@ class SECParser:
         toc_items = self._parse_toc_from_links(soup)
         anchored_count = sum(1 for v in toc_items.values() if v.get("anchor"))
         if toc_items and len(toc_items) >= 5 and anchored_count >= 5:
-            broad_soup = BeautifulSoup(html_content[: self.toc_fallback_prefix_length], "html.parser")
+            broad_soup = BeautifulSoup(html_content[: self.toc_fallback_prefix_length], _SOUP_PARSER)
             broad_items = self._parse_toc_from_links(broad_soup)
+            broad_soup.decompose()
+            soup.decompose()
             toc_items = _merge_missing(toc_items, broad_items)
             return toc_items
  
         # Some filings place index/TOC links outside the immediate TOC marker
         # region (e.g., repeated page headers with linked ITEM anchors).
         # Fallback to a larger prefix scan, then full-document link scan.
-        broad_soup = BeautifulSoup(html_content[: self.toc_fallback_prefix_length], "html.parser")
+        broad_soup = BeautifulSoup(html_content[: self.toc_fallback_prefix_length], _SOUP_PARSER)
         toc_items = self._parse_toc_from_links(broad_soup)
+        # Parse trees hold reference cycles; release them eagerly rather than
+        # waiting for the cyclic GC, which keeps peak memory down on large filings.
+        broad_soup.decompose()
         anchored_count = sum(1 for v in toc_items.values() if v.get("anchor"))
         if toc_items and len(toc_items) >= 5 and anchored_count >= 5:
+            soup.decompose()
             return toc_items
 
-        full_soup = BeautifulSoup(html_content, "html.parser")
+        full_soup = BeautifulSoup(html_content, _SOUP_PARSER)
         toc_items = self._parse_toc_from_links(full_soup)
+        full_soup.decompose()
         anchored_count = sum(1 for v in toc_items.values() if v.get("anchor"))
         if toc_items and len(toc_items) >= 5 and anchored_count >= 5:
+            soup.decompose()
             return toc_items
 
         # If no explicit marker exists, do not perform loose structure fallback.
         if not has_explicit_marker:
+            soup.decompose()
             return None
 
         # Fallback: analyze document structure (but limit search)
+        if _SOUP_PARSER != "html.parser":
+            # The anchor-proximity check relies on sourceline, which only
+            # html.parser records.
+            soup.decompose()
+            soup = BeautifulSoup(toc_region_html, "html.parser")
         toc_items = self._find_toc_from_structure(soup, filing_type)
+        soup.decompose()
         
         # Only return if we found at least 2 items
         if len(toc_items) >= 2:
@@ -492,6 +602,29 @@ class SECParser:
         
         return None
     
+    def _find_end_marker(self, html_content: str, start_pos: int) -> int:
+        """
+        Find the end-of-items boundary (signatures, exhibits, cover) after a position
+
+        Markers are tried in end_marker_patterns order; the first pattern
+        that matches anywhere after start_pos wins.
+
+        Args:
+            html_content: HTML content of the filing
+            start_pos: Position to search from
+
+        Returns:
+            Position of the tag opening the marker, or -1 if no marker is found
+        """
+        for compiled_pattern in self.end_marker_patterns:
+            marker_match = compiled_pattern.search(html_content, start_pos)
+            if marker_match:
+                # Find the tag opening < before this marker
+                marker_pos = marker_match.start()
+                tag_open = html_content.rfind('<', 0, marker_pos)
+                return tag_open if tag_open != -1 else marker_pos
+        return -1
+
     def get_item_positions(self, html_content: str, 
                           toc_items: Dict[str, Dict[str, str]]) -> Dict[str, Tuple[int, int]]:
         """
@@ -504,7 +637,6 @@ class SECParser:
         Returns:
             Dictionary mapping item numbers to (start_pos, end_pos) tuples
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
         positions = {}
         
         # Preserve TOC appearance order. This is important for combined rows
@@ -512,14 +644,30 @@ class SECParser:
         # have the same section boundary before the next TOC item (e.g., Item 1A).
         sorted_items = list(toc_items.keys())
 
+        # Offsets of every id/name attribute, keyed by lowercased value (the
+        # per-anchor patterns are case-insensitive). Built on first use.
+        anchor_index: Optional[Dict[str, List[int]]] = None
+
+        def _anchor_attr_pos(anchor_val: str, search_from: int) -> int:
+            nonlocal anchor_index
+            if anchor_index is None:
+                anchor_index = {}
+                for m in _ANCHOR_ATTR_RE.finditer(html_content):
+                    anchor_index.setdefault(m.group(1).lower(), []).append(m.start())
+            offsets = anchor_index.get(anchor_val.lower())
+            if offsets:
+                k = bisect_left(offsets, search_from)
+                return offsets[k] if k < len(offsets) else -1
+            # Values the index cannot hold (e.g. containing quotes)
+            m = self._anchor_attr_pattern(anchor_val).search(html_content, search_from)
+            return m.start() if m else -1
+
         def _anchor_start(anchor_val: Optional[str], search_from: int = 0) -> int:
             if not anchor_val:
                 return -1
-            anchor_pattern = rf'(?:id|name)\s*=\s*[\'\"]{re.escape(anchor_val)}[\'\"]'
-            m = re.search(anchor_pattern, html_content[search_from:], re.IGNORECASE)
-            if not m:
+            pos = _anchor_attr_pos(anchor_val, search_from)
+            if pos == -1:
                 return -1
-            pos = search_from + m.start()
             tag_open = html_content.rfind('<', 0, pos)
             return tag_open if tag_open != -1 else pos
 
@@ -531,17 +679,10 @@ class SECParser:
             """
             if hi <= lo:
                 return -1
-            window = html_content[lo:hi]
-            # Allow tags/non-breaking spaces between ITEM and item number.
-            item_pat = re.compile(
-                rf'ITEM(?:\s|&nbsp;|&#160;|<[^>]+>){{0,20}}{re.escape(item_num)}(?:\b|[.:])',
-                re.IGNORECASE,
-            )
-            matches = list(item_pat.finditer(window))
+            matches = list(self._item_heading_pattern(item_num).finditer(html_content, lo, hi))
             if not matches:
                 return -1
-            m = matches[-1]
-            pos = lo + m.start()
+            pos = matches[-1].start()
             tag_open = html_content.rfind('<', lo, pos)
             return tag_open if tag_open != -1 else pos
 
@@ -565,12 +706,11 @@ class SECParser:
             """
             if end_pos <= start_pos:
                 return end_pos
-            segment = html_content[start_pos:end_pos]
-            match = self.part_heading_html_pattern.search(segment)
+            match = self.part_heading_html_pattern.search(html_content, start_pos, end_pos)
             if not match:
                 return end_pos
 
-            candidate = start_pos + match.start()
+            candidate = match.start()
             # Guardrails to avoid truncating on incidental in-text mentions.
             if (candidate - start_pos) < 200:
                 return end_pos
@@ -583,17 +723,8 @@ class SECParser:
         for i, item_num in enumerate(sorted_items):
             anchor = toc_items[item_num].get('anchor')
             
-            # Find the element with this anchor
-            start_element = None
-            
-            if anchor:
-                # Look for anchor by name or id
-                start_element = soup.find(attrs={'name': anchor})
-                if not start_element:
-                    start_element = soup.find(attrs={'id': anchor})
-            
-            # Determine start position in raw HTML (avoid BeautifulSoup re-serialization)
-            # Find the anchor id/name attribute, then locate the opening tag
+            # Determine start position in raw HTML: find the anchor id/name
+            # attribute, then locate the opening tag
             start_pos = -1
             if anchor:
                 start_pos = _anchor_start(anchor, 0)
@@ -639,16 +770,10 @@ class SECParser:
                         next_anchor = toc_items[next_item].get('anchor')
 
                     if next_item and next_anchor:
-                        next_anchor_pattern = rf'(?:id|name)\s*=\s*[\'\"]{re.escape(next_anchor)}[\'\"]'
-                        next_anchor_match = re.search(next_anchor_pattern, html_content[start_pos:], re.IGNORECASE)
-                        if next_anchor_match:
-                            # Find the tag opening < before this anchor
-                            anchor_pos_in_full = start_pos + next_anchor_match.start()
-                            tag_open = html_content.rfind('<', 0, anchor_pos_in_full)
-                            if tag_open != -1:
-                                end_pos = tag_open
-                            else:
-                                end_pos = anchor_pos_in_full
+                        # Opening tag of the next anchor at or after this item
+                        next_anchor_pos = _anchor_start(next_anchor, start_pos)
+                        if next_anchor_pos != -1:
+                            end_pos = next_anchor_pos
                     elif next_item:
                         # Next item has no anchor: fallback to next heading search.
                         # Limit search to before the next anchored item after current.
@@ -672,32 +797,16 @@ class SECParser:
                     else:
                         # No next distinct item found (all remaining share same anchor).
                         # Fall through to end-marker boundary like the last item case.
-                        for compiled_pattern in self.end_marker_patterns:
-                            marker_match = compiled_pattern.search(html_content[start_pos:])
-                            if marker_match:
-                                marker_pos_in_full = start_pos + marker_match.start()
-                                tag_open = html_content.rfind('<', 0, marker_pos_in_full)
-                                if tag_open != -1:
-                                    end_pos = tag_open
-                                else:
-                                    end_pos = marker_pos_in_full
-                                break
+                        marker_pos = self._find_end_marker(html_content, start_pos)
+                        if marker_pos != -1:
+                            end_pos = marker_pos
                     end_pos = trim_end_at_part_heading(start_pos, end_pos)
 
                 else:
                     # For the last item, search for end-marker IDs as boundary
-                    # OPTIMIZED: Use pre-compiled patterns instead of compiling on each use
-                    for compiled_pattern in self.end_marker_patterns:
-                        marker_match = compiled_pattern.search(html_content[start_pos:])
-                        if marker_match:
-                            # Find the tag opening < before this marker
-                            marker_pos_in_full = start_pos + marker_match.start()
-                            tag_open = html_content.rfind('<', 0, marker_pos_in_full)
-                            if tag_open != -1:
-                                end_pos = tag_open
-                            else:
-                                end_pos = marker_pos_in_full
-                            break
+                    marker_pos = self._find_end_marker(html_content, start_pos)
+                    if marker_pos != -1:
+                        end_pos = marker_pos
 
                 positions[item_num] = (start_pos, end_pos)
         
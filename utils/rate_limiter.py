@@ -0,0 +1,49 @@
+"""
+Token-bucket rate limiter shared by SEC HTTP clients
+"""
+
+import threading
+import time
+
+from utils.config import REQUEST_DELAY, REQUEST_BURST
+
+
+class TokenBucket:
+    """Thread-safe token bucket: allows bursts up to `capacity`, `rate` tokens/second on average"""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize TokenBucket
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of stored tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """
+        Block until `tokens` are available, then consume them
+
+        Args:
+            tokens: Number of tokens to consume
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# SEC limits requests per client, so every downloader/index parser in the
+# process draws from the same bucket by default.
+SEC_RATE_LIMITER = TokenBucket(rate=1.0 / REQUEST_DELAY, capacity=REQUEST_BURST)
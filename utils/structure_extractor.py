@@ -2,11 +2,48 @@
 Structure Extractor - Extract hierarchical heading-body pairs from SEC filing items
 """
 
-from bs4 import BeautifulSoup, Tag
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence
+import os
 import re
 import unicodedata
 
+from lxml import etree
+
+_BOLD_STYLE_RE = re.compile(r'font-weight\s*:\s*(bold|[6-9]00)')
+_ITALIC_STYLE_RE = re.compile(r'font-style\s*:\s*italic')
+_UNDERLINE_STYLE_RE = re.compile(r'text-decoration\s*:\s*underline')
+_CENTER_STYLE_RE = re.compile(r'text-align\s*:\s*center')
+_ITEM_HEADING_RE = re.compile(r'^\s*items?\s+\d+[a-z]?\b', re.IGNORECASE)
+_ITEM_TOKEN_RE = re.compile(r'items?\s+(\d+[a-z]?)', re.IGNORECASE)
+_ITEM_PREFIX_RE = re.compile(r'^\s*item\s+\d+[a-z]?\s*\.?\s*', re.IGNORECASE)
+_PART_LINE_RE = re.compile(r'part\s+[ivxlcdm]+')
+_TABLE_LABEL_RE = re.compile(r'^table\s+\d+(\.\d+)*[:.]?\b')
+_PAGE_NUMBER_RE = re.compile(r'\d{1,4}')
+_PAGE_LABEL_RE = re.compile(r'page\s+\d{1,4}(?:\s+of\s+\d{1,4})?')
+_PAGE_FORM_RE = re.compile(r'\|\s*\d{4}\s*Form\s*10-[KQ]\s*\|')
+_NON_LETTER_RE = re.compile(r'[^A-Za-z]')
+_TITLE_LINE_RE = re.compile(r'^[A-Z][A-Za-z0-9,&/\-\'(). ]+$')
+_WORD_RE = re.compile(r"[A-Za-z][A-Za-z'\\-]*")
+_NAME_INTRO_RES = (
+    re.compile(r'^(Mr|Ms|Mrs|Dr)\.\s+[A-Z][A-Za-z\'\-]+(?:\s+[A-Z][A-Za-z\'\-]+){0,3}\s+is\b'),
+    re.compile(r'^[A-Z][A-Za-z\'\-]+(?:\s+[A-Z][A-Za-z\'\-]+){1,4}\s*,\s*\d{1,3}\s*,?\s+has\b'),
+    re.compile(r'^[A-Z][A-Za-z\'\-]+(?:\s+[A-Z][A-Za-z\'\-]+){1,4}\s+is\b'),
+)
+_APOSTROPHE_RE = re.compile(r"['’]")
+_NON_ALNUM_RE = re.compile(r'[^A-Za-z0-9]+')
+_WS_RE = re.compile(r'\s+')
+# Smart quotes and dashes become ASCII; bullet/ornament symbols become spaces
+_PUNCT_REPLACEMENTS = {
+    '\u2018': "'",
+    '\u2019': "'",
+    '\u201c': '"',
+    '\u201d': '"',
+    '\u2013': '-',
+    '\u2014': '-',
+    **dict.fromkeys('\u2022\u25CF\u25A0\u25AA\u25E6\u2043\u2219', ' '),
+}
+
 
 class StructureExtractor:
     """Extracts hierarchical heading-body structure from SEC filing item HTML"""
@@ -31,21 +68,15 @@ class StructureExtractor:
         Returns:
             List of structured elements with heading, body, and layer information
         """
-        soup = BeautifulSoup(item_html, 'lxml')
-        
-        # Remove script and style tags
-        for tag in soup(['script', 'style']):
-            tag.decompose()
-        
-        # Build flat list of all potential elements first
-        elements = self._collect_elements(soup)
+        root = self._parse_html(item_html)
         
-        # Build hierarchical structure from flat list
+        # Stream potential elements straight into the hierarchy builder
+        elements = self._collect_elements(root) if root is not None else ()
         structure = self._build_hierarchy(elements)
         
         # If no structure found, return simple text
         if not structure:
-            text_content = self._clean_text(soup.get_text())
+            text_content = self._clean_text(self._node_text(root)) if root is not None else ''
             if text_content:
                 structure.append({
                     'type': 'simple_text',
@@ -61,20 +92,70 @@ class StructureExtractor:
 
         return structure
     
-    def _collect_elements(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+    @classmethod
+    def extract_many(cls, item_htmls: Sequence[str],
+                     root_headings: Optional[Sequence[Optional[str]]] = None,
+                     workers: Optional[int] = None) -> List[List[Dict[str, Any]]]:
         """
-        Collect all heading and content elements from the soup
+        Extract structure for several items over a process pool
         
         Args:
-            soup: BeautifulSoup object
+            item_htmls: HTML content of each item
+            root_headings: Optional root heading per item (same order)
+            workers: Worker processes (defaults to the CPU count)
             
         Returns:
-            List of element dictionaries with type, layer, heading, and raw_element
+            One structure list per item, in input order
         """
-        elements: List[Dict[str, Any]] = []
-
-        for block in self._iter_blocks_in_order(soup):
-            text = self._clean_text(block.get_text())
+        if root_headings is None:
+            root_headings = [None] * len(item_htmls)
+        workers = min(workers or os.cpu_count() or 1, len(item_htmls))
+        if workers <= 1:
+            extractor = cls()
+            return [
+                extractor.extract_structure(item_html, root_heading=root_heading)
+                for item_html, root_heading in zip(item_htmls, root_headings)
+            ]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_extract_structure_worker, item_htmls, root_headings, chunksize=4))
+
+    def _parse_html(self, item_html: str) -> Optional[etree._Element]:
+        """
+        Parse item HTML with lxml and drop script/style elements, comments
+        and processing instructions. Returns None when the markup contains
+        no elements.
+        """
+        # feed() accepts str input that carries an XML encoding declaration,
+        # which fromstring() rejects.
+        parser = etree.HTMLParser(remove_comments=True, remove_pis=True)
+        parser.feed(item_html)
+        root = parser.close()
+        if root is not None:
+            etree.strip_elements(root, 'script', 'style', with_tail=False)
+        return root
+
+    def _node_text(self, node: etree._Element) -> str:
+        """Concatenated text of an element and its descendants"""
+        return ''.join(node.itertext())
+
+    def _collect_elements(self, root: etree._Element) -> Iterator[Dict[str, Any]]:
+        """
+        Collect all heading and content elements from the parsed tree
+        
+        Args:
+            root: Root element of the parsed item HTML
+            
+        Returns:
+            Iterator of element dictionaries in document order: headings
+            carry type, layer and heading; body elements carry type and content
+        """
+        for block in self._iter_blocks_in_order(root):
+            raw = self._node_text(block)
+            # Spacer/layout blocks hold only whitespace; skip them before
+            # normalization.
+            if not raw or raw.isspace():
+                continue
+            text = self._clean_text(raw)
             if not text:
                 continue
             if self._is_page_marker(text):
@@ -88,44 +169,20 @@ class StructureExtractor:
                 heading_info = self._get_heading_info(block, heading_text)
                 if heading_info is None:
                     heading_info = {'text': heading_text, 'level': 2, 'style_type': 'bold'}
-                elements.append({
-                    'type': 'heading',
-                    'layer': heading_info['level'],
-                    'style_type': heading_info['style_type'],
-                    'heading': heading_info['text'],
-                    'element': block,
-                    'is_heading': True
-                })
+                yield {'type': 'heading', 'layer': heading_info['level'], 'heading': heading_info['text']}
                 if body_text:
-                    elements.append({
-                        'type': 'body',
-                        'content': body_text,
-                        'element': block,
-                        'is_heading': False
-                    })
+                    yield {'type': 'body', 'content': body_text}
                 continue
 
             heading_info = self._get_heading_info(block, text)
             if heading_info is not None:
-                elements.append({
-                    'type': 'heading',
-                    'layer': heading_info['level'],
-                    'style_type': heading_info['style_type'],
-                    'heading': heading_info['text'],
-                    'element': block,
-                    'is_heading': True
-                })
-            elif self._is_body_content(block, text):
-                elements.append({
-                    'type': 'body',
-                    'content': text,
-                    'element': block,
-                    'is_heading': False
-                })
-        
-        return elements
+                yield {'type': 'heading', 'layer': heading_info['level'], 'heading': heading_info['text']}
+            else:
+                # Page markers and noise lines were rejected above, so a
+                # non-heading block is body text.
+                yield {'type': 'body', 'content': text}
 
-    def _split_bold_lead(self, block: Tag, text: str) -> Optional[tuple]:
+    def _split_bold_lead(self, block: etree._Element, text: str) -> Optional[tuple]:
         """
         If a block starts with a bold lead-in (e.g., 'Talent Development.')
         followed by regular text, split into heading + body.
@@ -134,13 +191,13 @@ class StructureExtractor:
             return None
         # Find the first bold-ish descendant.
         lead = None
-        for node in block.find_all(True):
-            if node.name in {'b', 'strong'}:
-                lead = node.get_text()
+        for node in block.iterdescendants():
+            if node.tag in {'b', 'strong'}:
+                lead = self._node_text(node)
                 break
             style = (node.get('style') or '').lower()
-            if re.search(r'font-weight\s*:\s*(bold|[6-9]00)', style):
-                lead = node.get_text()
+            if 'font-weight' in style and _BOLD_STYLE_RE.search(style):
+                lead = self._node_text(node)
                 break
         if not lead:
             return None
@@ -164,54 +221,64 @@ class StructureExtractor:
         heading = lead_clean.rstrip('.:').strip()
         return heading, remainder
 
-    def _iter_blocks_in_order(self, soup: BeautifulSoup):
+    def _iter_blocks_in_order(self, root: etree._Element):
         """
         Yield candidate text blocks in document order.
         Skip container divs that only wrap smaller block elements to avoid duplicates.
         """
-        for tag in soup.find_all(self.block_tags):
-            if tag.name == 'div':
-                if tag.find(['p', 'li', 'td', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
+        # Mark every div that wraps a smaller block in one pass up from those
+        # blocks, instead of searching each div's subtree.
+        wrappers = set()
+        for inner in root.iter('p', 'li', 'td', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
+            for ancestor in inner.iterancestors('div'):
+                if ancestor in wrappers:
+                    # Its div ancestors were marked when it was added.
+                    break
+                wrappers.add(ancestor)
+
+        for tag in root.iter(*self.block_tags):
+            if tag.tag == 'div':
+                if tag in wrappers:
                     continue
-            if tag.name == 'table':
+            if tag.tag == 'table':
                 # Treat table as one plain body block, skip nested cells elsewhere.
                 yield tag
                 continue
-            if tag.find_parent('table'):
+            if next(tag.iterancestors('table'), None) is not None:
                 continue
             yield tag
 
-    def _style_blob(self, tag: Tag) -> str:
+    def _style_blob(self, tag: etree._Element) -> str:
         """
         Aggregate style attributes from tag and descendants.
         """
         chunks = []
         if tag.get('style'):
             chunks.append(tag.get('style'))
-        for child in tag.find_all(True):
+        for child in tag.iterdescendants():
             st = child.get('style')
             if st:
                 chunks.append(st)
         return " ".join(chunks).lower()
 
     def _is_item_heading_text(self, text: str) -> bool:
-        return bool(re.match(r'^\s*items?\s+\d+[a-z]?\b', text, flags=re.IGNORECASE))
+        return bool(_ITEM_HEADING_RE.match(text))
 
     def _looks_like_noise_line(self, text: str) -> bool:
         t = text.strip().lower()
         if t in {"table of contents", "index to exhibits", "index to financial statements"}:
             return True
-        if re.fullmatch(r'part\s+[ivxlcdm]+', t):
+        if _PART_LINE_RE.fullmatch(t):
             return True
-        if re.match(r'^table\s+\d+(\.\d+)*[:.]?\b', t):
+        if _TABLE_LABEL_RE.match(t):
             return True
-        if re.fullmatch(r'\d{1,4}', t):
+        if _PAGE_NUMBER_RE.fullmatch(t):
             return True
-        if re.fullmatch(r'page\s+\d{1,4}(?:\s+of\s+\d{1,4})?', t):
+        if _PAGE_LABEL_RE.fullmatch(t):
             return True
         return False
 
-    def _get_heading_info(self, block: Tag, text: str) -> Optional[Dict[str, Any]]:
+    def _get_heading_info(self, block: etree._Element, text: str) -> Optional[Dict[str, Any]]:
         """
         Determine whether a block is a heading and assign layer.
         
@@ -224,18 +291,35 @@ class StructureExtractor:
         """
         if len(text) < self.min_heading_length:
             return None
-        if block.name == 'table':
+        if block.tag == 'table':
             return None
 
-        style_blob = self._style_blob(block)
-        has_bold = bool(re.search(r'font-weight\s*:\s*(bold|[6-9]00)', style_blob)) or block.find(['b', 'strong']) is not None
-        has_italic = bool(re.search(r'font-style\s*:\s*italic', style_blob)) or block.find(['i', 'em']) is not None
-        has_underline = bool(re.search(r'text-decoration\s*:\s*underline', style_blob))
-        is_center = bool(re.search(r'text-align\s*:\s*center', style_blob)) or (str(block.get('align', '')).lower() == 'center')
-
         if self._is_item_heading_text(text):
             return {'text': text, 'level': 1, 'style_type': 'item'}
 
+        # Past the normal heading length only a bold sentence of bounded
+        # length can qualify, so reject the rest before reading styles.
+        if len(text) > self.max_heading_length and (
+            len(text) > self.max_bold_sentence_heading_length or not text.endswith('.')
+        ):
+            return None
+
+        # Substring checks skip the style regexes when the property is absent.
+        style_blob = self._style_blob(block)
+        has_bold = (
+            ('font-weight' in style_blob and bool(_BOLD_STYLE_RE.search(style_blob)))
+            or next(block.iterdescendants('b', 'strong'), None) is not None
+        )
+        has_italic = (
+            ('font-style' in style_blob and bool(_ITALIC_STYLE_RE.search(style_blob)))
+            or next(block.iterdescendants('i', 'em'), None) is not None
+        )
+        has_underline = 'text-decoration' in style_blob and bool(_UNDERLINE_STYLE_RE.search(style_blob))
+        is_center = (
+            ('text-align' in style_blob and bool(_CENTER_STYLE_RE.search(style_blob)))
+            or (str(block.get('align', '')).lower() == 'center')
+        )
+
         # Avoid false layer-3 headings where only a person's name is bolded in
         # an executive-officer biography sentence (e.g., "Mr. X is ...").
         if has_bold and self._is_name_intro_sentence(text):
@@ -263,11 +347,11 @@ class StructureExtractor:
             score += 1
 
         # Title-like forms: ALL CAPS or short title without trailing punctuation.
-        letters = re.sub(r'[^A-Za-z]', '', text)
+        letters = _NON_LETTER_RE.sub('', text)
         upper_ratio = (sum(ch.isupper() for ch in letters) / len(letters)) if letters else 0.0
         if upper_ratio >= 0.60:
             score += 1
-        if re.match(r'^[A-Z][A-Za-z0-9,&/\-\'(). ]+$', text) and not text.endswith('.'):
+        if _TITLE_LINE_RE.match(text) and not text.endswith('.'):
             score += 1
 
         # Long sentence-like lines are usually body, not heading, unless explicitly bold.
@@ -309,12 +393,7 @@ class StructureExtractor:
         if ":" in t[:80]:
             return False
 
-        patterns = [
-            r'^(Mr|Ms|Mrs|Dr)\.\s+[A-Z][A-Za-z\'\-]+(?:\s+[A-Z][A-Za-z\'\-]+){0,3}\s+is\b',
-            r'^[A-Z][A-Za-z\'\-]+(?:\s+[A-Z][A-Za-z\'\-]+){1,4}\s*,\s*\d{1,3}\s*,?\s+has\b',
-            r'^[A-Z][A-Za-z\'\-]+(?:\s+[A-Z][A-Za-z\'\-]+){1,4}\s+is\b',
-        ]
-        return any(re.match(p, t) for p in patterns)
+        return any(p.match(t) for p in _NAME_INTRO_RES)
 
     def _looks_like_titlecase_heading(self, text: str) -> bool:
         """
@@ -325,29 +404,29 @@ class StructureExtractor:
             return False
         if len(t) > 260:
             return False
-        words = re.findall(r"[A-Za-z][A-Za-z'\\-]*", t)
+        words = _WORD_RE.findall(t)
         if len(words) < 4:
             return False
         capped = sum(1 for w in words if w[0].isupper())
         return (capped / max(1, len(words))) >= 0.6
 
-    def _bold_only_bullet(self, block: Tag) -> bool:
+    def _bold_only_bullet(self, block: etree._Element) -> bool:
         """
         Detect cases where a bullet is bold but the actual sentence is not.
         """
         found_bold = False
-        for node in block.find_all(True):
+        for node in block.iterdescendants():
             style = (node.get('style') or '').lower()
-            is_bold = node.name in {'b', 'strong'} or bool(re.search(r'font-weight\s*:\s*(bold|[6-9]00)', style))
+            is_bold = node.tag in {'b', 'strong'} or ('font-weight' in style and bool(_BOLD_STYLE_RE.search(style)))
             if not is_bold:
                 continue
             found_bold = True
-            txt = self._clean_text(node.get_text())
+            txt = self._clean_text(self._node_text(node))
             if txt and txt not in {'•'}:
                 return False
         return found_bold
 
-    def _is_body_content(self, block: Tag, text: str) -> bool:
+    def _is_body_content(self, block: etree._Element, text: str) -> bool:
         """
         Check if block is body content.
         """
@@ -362,7 +441,7 @@ class StructureExtractor:
         return True
 
     def _extract_item_token(self, title: str) -> Optional[str]:
-        m = re.search(r'items?\s+(\d+[a-z]?)', title or '', flags=re.IGNORECASE)
+        m = _ITEM_TOKEN_RE.search(title or '')
         return m.group(1).upper() if m else None
 
     def _is_item_heading_node(self, node: Dict[str, Any], token: Optional[str]) -> bool:
@@ -370,7 +449,7 @@ class StructureExtractor:
             return False
         h = str(node.get('heading') or '')
         if not token:
-            return bool(re.match(r'^\s*items?\s+\d+[a-z]?\b', h, flags=re.IGNORECASE))
+            return bool(_ITEM_HEADING_RE.match(h))
         return bool(re.match(rf'^\s*items?\s+{re.escape(token)}\b', h, flags=re.IGNORECASE))
 
     def _bump_layers(self, nodes: List[Dict[str, Any]], min_layer: int = 2) -> None:
@@ -443,9 +522,9 @@ class StructureExtractor:
         if not txt:
             return txt
         def norm(s: str) -> str:
-            s = re.sub(r"['’]", '', s)
-            s = re.sub(r'[^A-Za-z0-9]+', ' ', s)
-            return re.sub(r'\s+', ' ', s).strip().lower()
+            s = _APOSTROPHE_RE.sub('', s)
+            s = _NON_ALNUM_RE.sub(' ', s)
+            return _WS_RE.sub(' ', s).strip().lower()
 
         def strip_prefix(original: str, prefix_norm: str) -> Optional[str]:
             if not prefix_norm:
@@ -472,7 +551,7 @@ class StructureExtractor:
             return original[last_index:].lstrip(" .:-|,;/")
 
         root_clean = root_title or ''
-        root_no_item = re.sub(r'^\s*item\s+\d+[a-z]?\s*\.?\s*', '', root_clean, flags=re.IGNORECASE)
+        root_no_item = _ITEM_PREFIX_RE.sub('', root_clean)
         candidates = [root_clean, root_no_item]
         for cand in candidates:
             cand_norm = norm(cand)
@@ -482,18 +561,27 @@ class StructureExtractor:
                     return stripped.strip()
         return txt
 
-    def _build_hierarchy(self, elements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _build_hierarchy(self, elements: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Build hierarchical structure from flat list of elements.
+        Build hierarchical structure from a flat stream of elements.
         """
-        if not elements:
-            return []
-
         structure: List[Dict[str, Any]] = []
         heading_stack: List[Dict[str, Any]] = []
+        # Body fragments are collected per node and joined once at the end;
+        # repeated += copies the growing string on every fragment.
+        body_parts: Dict[int, List[str]] = {}
+        nodes_with_body: List[Dict[str, Any]] = []
+
+        def add_body(node: Dict[str, Any], content: str) -> None:
+            parts = body_parts.get(id(node))
+            if parts is None:
+                body_parts[id(node)] = [content]
+                nodes_with_body.append(node)
+            else:
+                parts.append(content)
 
         for elem in elements:
-            if elem['is_heading']:
+            if elem['type'] == 'heading':
                 level = int(elem['layer'])
 
                 while heading_stack and heading_stack[-1]['layer'] >= level:
@@ -516,22 +604,20 @@ class StructureExtractor:
             else:
                 if not heading_stack:
                     # Keep pre-heading text if present
-                    if structure and structure[-1].get('type') == 'simple_text':
-                        structure[-1]['body'] += ' ' + elem['content']
-                    else:
+                    if not (structure and structure[-1].get('type') == 'simple_text'):
                         structure.append({
                             'type': 'simple_text',
                             'layer': 1,
                             'heading': None,
-                            'body': elem['content'],
+                            'body': None,
                             'children': []
                         })
+                    add_body(structure[-1], elem['content'])
                 else:
-                    cur = heading_stack[-1]
-                    if cur['body'] is None:
-                        cur['body'] = elem['content']
-                    else:
-                        cur['body'] += ' ' + elem['content']
+                    add_body(heading_stack[-1], elem['content'])
+
+        for node in nodes_with_body:
+            node['body'] = ' '.join(body_parts[id(node)])
 
         return structure
 
@@ -540,7 +626,7 @@ class StructureExtractor:
         if 'PAGE_BREAK_MARKER' in text:
             return True
         # Check for patterns like "Apple Inc. | 2022 Form 10-K | 1"
-        if re.search(r'\|\s*\d{4}\s*Form\s*10-[KQ]\s*\|', text):
+        if '|' in text and _PAGE_FORM_RE.search(text):
             return True
         return False
 
@@ -556,22 +642,18 @@ class StructureExtractor:
         """
         if not text:
             return ''
-        text = unicodedata.normalize("NFKC", text)
-        text = "".join(ch for ch in text if unicodedata.category(ch) != "Cf")
-        text = text.replace('\u2018', "'").replace('\u2019', "'")
-        text = text.replace('\u201c', '"').replace('\u201d', '"')
-        text = text.replace('\u2013', '-').replace('\u2014', '-')
-        text = re.sub(r'[\u2022\u25CF\u25A0\u25AA\u25E6\u2043\u2219]', ' ', text)
-
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
-        
-        # Remove special characters that are artifacts
-        text = re.sub(r'[\xa0\u200b\u200c\u200d\ufeff]', ' ', text)
-        text = re.sub(r'\s+', ' ', text)
-        
-        return text.strip()
+        if not text.isascii():
+            text = unicodedata.normalize("NFKC", text)
+            # NFKC turns NBSP into a space, and zero-width characters are
+            # Cf, so one pass over the distinct characters handles both
+            # along with punctuation and bullets.
+            for ch in set(text):
+                replacement = _PUNCT_REPLACEMENTS.get(ch)
+                if replacement is None and unicodedata.category(ch) == "Cf":
+                    replacement = ''
+                if replacement is not None:
+                    text = text.replace(ch, replacement)
+        return _WS_RE.sub(' ', text).strip()
 
     # Legacy helper kept for compatibility; unused in current style-based layering.
     def _get_heading_layer(self, tag_name: str, heading_stack: List[tuple]) -> int:
@@ -579,7 +661,17 @@ class StructureExtractor:
         return level
 
     # Backward-compatible signature; unused by current collector.
-    def _is_body_content_legacy(self, div: Tag) -> bool:
-        text = div.get_text().strip()
+    def _is_body_content_legacy(self, div: etree._Element) -> bool:
+        text = self._node_text(div).strip()
         return bool(text) and not self._is_page_marker(text)
 
+
+_WORKER_EXTRACTOR: Optional[StructureExtractor] = None
+
+
+def _extract_structure_worker(item_html: str, root_heading: Optional[str]) -> List[Dict[str, Any]]:
+    """Process-pool entry point for StructureExtractor.extract_many"""
+    global _WORKER_EXTRACTOR
+    if _WORKER_EXTRACTOR is None:
+        _WORKER_EXTRACTOR = StructureExtractor()
+    return _WORKER_EXTRACTOR.extract_structure(item_html, root_heading=root_heading)
@@ -0,0 +1,92 @@
+"""
+Ticker to CIK cache backed by SEC's company_tickers.json
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+
+from utils.config import SEC_BASE_URL, CACHE_DIR, REQUEST_TIMEOUT
+
+TICKERS_URL = f"{SEC_BASE_URL}/files/company_tickers.json"
+TICKER_CACHE_TTL = 7 * 24 * 3600  # seconds
+
+
+class TickerCache:
+    """Resolves tickers to CIKs from a locally cached copy of the SEC ticker list"""
+
+    def __init__(
+        self,
+        session: requests.Session,
+        cache_path: Optional[str] = None,
+        ttl: float = TICKER_CACHE_TTL,
+    ):
+        """
+        Initialize TickerCache
+
+        Args:
+            session: HTTP session used to refresh the ticker list
+            cache_path: Location of the cached JSON file
+            ttl: Age in seconds after which the cached file is refreshed
+        """
+        self.session = session
+        self.cache_path = cache_path or os.path.join(CACHE_DIR, "tickers.json")
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._map: Optional[Dict[str, str]] = None
+
+    def _is_fresh(self) -> bool:
+        try:
+            return (time.time() - os.path.getmtime(self.cache_path)) < self.ttl
+        except OSError:
+            return False
+
+    def _refresh(self) -> dict:
+        response = self.session.get(TICKERS_URL, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        # Unique per process/thread so concurrent refreshes never share a file
+        tmp_path = f"{self.cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.cache_path)
+        return data
+
+    def _load(self) -> Dict[str, str]:
+        data = None
+        if self._is_fresh():
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = None
+        if data is None:
+            data = self._refresh()
+
+        mapping: Dict[str, str] = {}
+        for entry in data.values():
+            ticker = str(entry.get("ticker", "")).upper()
+            if ticker and ticker not in mapping:
+                mapping[ticker] = str(entry["cik_str"]).zfill(10)
+        return mapping
+
+    def get(self, ticker: str) -> Optional[str]:
+        """
+        Look up the CIK for a ticker
+
+        Args:
+            ticker: Stock ticker symbol
+
+        Returns:
+            CIK number (padded to 10 digits) or None if not found
+        """
+        if self._map is None:
+            with self._lock:
+                if self._map is None:
+                    self._map = self._load()
+        return self._map.get(ticker.upper())